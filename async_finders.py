@@ -0,0 +1,154 @@
+"""
+Author:
+Nilusink
+
+AllKnowing / AllKnowing2 for async connection requesters (e.g. a
+`neighbor_server.NeighborClient`). the connections of a whole BFS layer
+are requested concurrently, so a query takes about layers * latency
+instead of nodes * latency
+"""
+from typing import Awaitable, Callable, Hashable
+from path_finders import AllKnowing, AllKnowing2, vec2_distance
+from search_stats import SearchStats, phase
+from renderers import Renderer
+from classes import Vec2
+import asyncio
+
+
+# `max_iterations` of `request_from_target`
+MAX_ITERATIONS: int = 300
+
+
+async def fetch_layers(
+        request_node_connections: Callable[[Hashable], Awaitable[list]],
+        fetched: dict,
+        start: Hashable,
+        semaphore: asyncio.Semaphore,
+        stop: Hashable = ...,
+        max_layers: int = ...,
+        stats: SearchStats | None = None,
+) -> int:
+    """
+    request the connections of everything reachable from start (breadth
+    first). all nodes of a layer are requested at once, as many at a time
+    as the semaphore allows. nodes already in `fetched` aren't requested again
+
+    :param stop: the layer containing stop is the last one
+    :param max_layers: no more than max_layers layers are requested
+    :return: number of layers
+    """
+    async def fetch(node: Hashable) -> None:
+        async with semaphore:
+            fetched[node] = await request_node_connections(node)
+
+    visited = {start}
+    frontier = [start]
+    n_layers = 0
+    while frontier and (max_layers is ... or n_layers < max_layers):
+        missing = [node for node in frontier if node not in fetched]
+        if stats is not None:
+            stats.frontier(len(frontier))
+            for node in missing:
+                stats.count_request(node)
+
+        await asyncio.gather(*(fetch(node) for node in missing))
+        n_layers += 1
+
+        if stop is not ... and stop in frontier:
+            break
+
+        next_frontier = []
+        for node in frontier:
+            for point in fetched[node]:
+                if point not in visited:
+                    visited.add(point)
+                    next_frontier.append(point)
+
+        frontier = next_frontier
+
+    return n_layers
+
+
+class _AsyncFinder:
+    """
+    fetches everything a query needs first, then runs the (synchronous)
+    finder on the fetched connections
+    """
+    def __init__(
+            self,
+            node_connections: dict[Vec2, list],
+            visible_nodes: list[Vec2],
+            sleep_time: float,
+            redraw_func: Callable,
+            draw_path_func: Callable,
+            request_node_connections: Callable[[Vec2], Awaitable[list]],
+            distance_func: Callable[[Vec2, Vec2], float] = vec2_distance,
+            renderer: Renderer = ...,
+            stats: SearchStats | None = None,
+            concurrency: int = 32,
+    ):
+        """
+        :param request_node_connections: async requester
+        :param concurrency: max requests at the same time
+        """
+        # connections of the current query
+        self._fetched: dict[Vec2, list] = {}
+        super().__init__(
+            node_connections,
+            visible_nodes,
+            sleep_time,
+            redraw_func,
+            draw_path_func,
+            self._fetched.__getitem__,
+            distance_func,
+            renderer,
+        )
+
+        # requests are counted when fetching, not when reading `_fetched`
+        self.stats = stats
+        self._async_requester = request_node_connections
+        self.concurrency = concurrency
+
+    async def calculate(self, origin: Vec2, target: Vec2) -> list[Vec2] | None:
+        """
+        calculate the path
+        """
+        self.connections = {}
+        self.connections_from_target = {}
+        self._fetched.clear()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        with phase(self.stats, "request_all"):
+            await fetch_layers(self._async_requester, self._fetched, origin, semaphore, stats=self.stats)
+            self.request_all(self.connections, origin)
+
+        with phase(self.stats, "request_from_target"):
+            # usually fetched already, unless target isn't reachable from origin
+            await fetch_layers(
+                self._async_requester,
+                self._fetched,
+                target,
+                semaphore,
+                stop=origin,
+                max_layers=MAX_ITERATIONS + 1,
+                stats=self.stats,
+            )
+            self.request_from_target(target, origin, self.connections_from_target, MAX_ITERATIONS)
+
+        if target not in self.connections:
+            return  # target was not found
+
+        with phase(self.stats, "node_finder"):
+            return self.find_path(origin, target)
+
+
+class AsyncAllKnowing(_AsyncFinder, AllKnowing):
+    """
+    `AllKnowing` with an async requester
+    """
+
+
+class AsyncAllKnowing2(_AsyncFinder, AllKnowing2):
+    """
+    `AllKnowing2` with an async requester
+    """
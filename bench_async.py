@@ -0,0 +1,78 @@
+"""
+Author:
+Nilusink
+
+AllKnowing / AllKnowing2 against a local neighbor server with simulated
+latency: one request after the other against the async finders with
+different concurrency limits
+"""
+from bench_common import generate_nodes
+from async_finders import AsyncAllKnowing, AsyncAllKnowing2, fetch_layers
+from neighbor_server import NeighborServer, NeighborClient
+from path_finders import AllKnowing, AllKnowing2
+from neighbors import build_node_connections
+from requesters import LatencySource
+from renderers import NullRenderer
+import numpy as np
+import asyncio
+import time
+
+
+N_NODES: int = 1_000
+NODE_RANGE: float = 100
+LATENCY: float = .002
+N_QUERIES: int = 2
+CONCURRENCY: list[int] = [1, 8, 64, 256]
+
+
+async def run_async(finder_type: type, node_connections: dict, client, queries: list, concurrency: int) -> tuple[list, float]:
+    finder = finder_type(node_connections, [], 0, None, None, client, renderer=NullRenderer(), concurrency=concurrency)
+
+    start = time.perf_counter()
+    paths = [await finder.calculate(origin, target) for origin, target in queries]
+    return paths, (time.perf_counter() - start) / len(queries)
+
+
+async def main():
+    rng = np.random.default_rng(0)
+    nodes = generate_nodes(N_NODES, rng)
+    node_connections = build_node_connections(nodes, NODE_RANGE)
+    queries = [(nodes[i], nodes[j]) for i, j in rng.choice(N_NODES, (N_QUERIES, 2))]
+
+    async with NeighborServer(node_connections, LATENCY) as server:
+        client = NeighborClient(server.nodes, port=server.port)
+
+        # layers of the BFS from every origin, the lower bound of the async finders
+        layers = []
+        for origin, _ in queries:
+            layers.append(await fetch_layers(client, {}, origin, asyncio.Semaphore(256)))
+
+        print(
+            f"graph: {N_NODES} nodes, latency {LATENCY * 1e3:.1f} ms, {N_QUERIES} queries, "
+            f"{np.mean(layers):.0f} layers -> {np.mean(layers) * LATENCY * 1e3:.0f} ms"
+        )
+        for sync_type, async_type in ((AllKnowing, AsyncAllKnowing), (AllKnowing2, AsyncAllKnowing2)):
+            source = LatencySource(node_connections, LATENCY)
+            finder = sync_type(node_connections, [], 0, None, None, lambda node: source(node), renderer=NullRenderer())
+            start = time.perf_counter()
+            expected = [finder.calculate(origin, target) for origin, target in queries]
+            sync_time = (time.perf_counter() - start) / N_QUERIES
+
+            print(f"{sync_type.__name__}")
+            print(f"  sync:            {source.round_trips / N_QUERIES:>6.0f} requests/query {sync_time * 1e3:>8.1f} ms/query")
+
+            for concurrency in CONCURRENCY:
+                requests = server.requests
+                paths, async_time = await run_async(async_type, node_connections, client, queries, concurrency)
+                assert paths == expected
+
+                print(
+                    f"  async, limit {concurrency:<3}{(server.requests - requests) / N_QUERIES:>6.0f} requests/query "
+                    f"{async_time * 1e3:>8.1f} ms/query"
+                )
+
+        await client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Author:
+Nilusink
+
+many (origin, target) pairs on one graph: `calculate` in a loop against
+the batch entry points
+"""
+from bench_common import generate_nodes, node_range_for
+from graph_search import many_to_many, distance_matrix
+from neighbors import build_node_connections
+from path_finders import DijkstraFinder
+from renderers import NullRenderer
+from graph import Graph
+import numpy as np
+import time
+
+
+N_NODES: int = 5_000
+N_ORIGINS: int = 20
+N_PAIRS: int = 2_000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    nodes = generate_nodes(N_NODES, rng)
+    node_range = node_range_for(N_NODES)
+
+    node_connections = build_node_connections(nodes, node_range)
+    finder = DijkstraFinder(node_connections, [], 0, None, None, node_connections.__getitem__, renderer=NullRenderer())
+
+    # few origins, many targets each (e.g. a handful of depots)
+    origins = rng.choice(N_NODES, N_ORIGINS, replace=False)
+    pairs = [(nodes[int(rng.choice(origins))], nodes[int(rng.integers(N_NODES))]) for _ in range(N_PAIRS)]
+
+    # `calculate` in a loop, only a part of the pairs for time reasons
+    n_loop = 100
+    start = time.perf_counter()
+    for origin, target in pairs[:n_loop]:
+        finder.calculate(origin, target)
+
+    loop = (time.perf_counter() - start) / n_loop
+
+    start = time.perf_counter()
+    lengths, _ = finder.calculate_many(pairs)
+    batch = (time.perf_counter() - start) / N_PAIRS
+
+    # the same on the compact graph (integer ids)
+    graph, ids = Graph.from_node_connections(node_connections)
+    id_pairs = [(ids[origin], ids[target]) for origin, target in pairs]
+    start = time.perf_counter()
+    distances, _ = many_to_many(graph, id_pairs)
+    graph_batch = (time.perf_counter() - start) / N_PAIRS
+
+    assert np.allclose(lengths, distances)
+
+    targets = [ids[node] for node in nodes[:N_PAIRS // N_ORIGINS]]
+    start = time.perf_counter()
+    matrix = distance_matrix(graph, [int(origin) for origin in origins], targets)
+    matrix_time = time.perf_counter() - start
+
+    print(f"graph: {N_NODES} nodes, {N_PAIRS} pairs from {N_ORIGINS} origins")
+    print(f"calculate (loop):         {1 / loop:>10.1f} pairs/s")
+    print(f"calculate_many:           {1 / batch:>10.1f} pairs/s ({loop / batch:.0f}x)")
+    print(f"many_to_many (graph):     {1 / graph_batch:>10.1f} pairs/s ({loop / graph_batch:.0f}x)")
+    print(f"distance_matrix (graph):  {matrix.size / matrix_time:>10.1f} entries/s, shape {matrix.shape}")
+
+
+if __name__ == '__main__':
+    main()
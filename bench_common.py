@@ -0,0 +1,29 @@
+"""
+Author:
+Nilusink
+
+random graphs for the bench_*.py scripts, the same distribution as
+`benchmark.generate_nodes`
+"""
+from benchmark import WIDTH, HEIGHT, generate_nodes
+import numpy as np
+
+
+AVERAGE_DEGREE: float = 17
+
+
+def node_range_for(n: int, average_degree: float = AVERAGE_DEGREE) -> float:
+    """
+    node range that gives n random nodes `average_degree` neighbors on average
+    """
+    return (average_degree * WIDTH * HEIGHT / (np.pi * n)) ** .5
+
+
+def random_xy(n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    (n, 2) coordinates, the same as `generate_nodes` draws from the same rng
+    """
+    xs = rng.integers(0, WIDTH, n)
+    ys = rng.integers(0, HEIGHT, n)
+
+    return np.stack((xs, ys), axis=1).astype(np.float64)
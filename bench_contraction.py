@@ -0,0 +1,67 @@
+"""
+Author:
+Nilusink
+
+contraction hierarchy against plain dijkstra: preprocessing time, index
+size and query latency
+"""
+from bench_common import node_range_for, random_xy
+from contraction_hierarchy import ContractionHierarchy
+from graph_search import dijkstra, unwind
+from neighbors import grid_pairs
+from graph import Graph
+import numpy as np
+import time
+
+
+N_NODES: int = 100_000
+N_QUERIES: int = 1_000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    xy = random_xy(N_NODES, rng)
+    node_range = node_range_for(N_NODES)
+    graph = Graph.from_pairs(xy, *grid_pairs(xy, node_range))
+    queries = [(int(rng.integers(N_NODES)), int(rng.integers(N_NODES))) for _ in range(N_QUERIES)]
+
+    print(f"graph: {N_NODES} nodes, {graph.n_edges} directed edges, {graph.nbytes / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(graph)
+    preprocessing = time.perf_counter() - start
+
+    print(f"preprocessing:    {preprocessing:>9.1f} s")
+    print(f"index:            {hierarchy.nbytes / 1e6:>9.1f} MB, {hierarchy.up.n_edges} upward edges "
+          f"({hierarchy.n_shortcuts} shortcuts)")
+
+    # dijkstra (stopping once the target is settled), only a few for time reasons
+    n_dijkstra = 20
+    expected: list[float] = []
+    start = time.perf_counter()
+    for origin, target in queries[:n_dijkstra]:
+        distances, parents, settled = dijkstra(graph, origin, {target})
+        if settled[target]:
+            graph.to_vec2_path(unwind(parents, target)[::-1])
+
+        expected.append(float(distances[target]))
+
+    per_dijkstra = (time.perf_counter() - start) / n_dijkstra
+
+    # queries including unpacking the full route
+    start = time.perf_counter()
+    for origin, target in queries:
+        hierarchy.route(origin, target)
+
+    per_query = (time.perf_counter() - start) / N_QUERIES
+
+    for (origin, target), distance in zip(queries, expected):
+        assert abs(hierarchy.distance(origin, target) - distance) < 1e-6
+
+    print(f"dijkstra:         {per_dijkstra * 1e3:>9.3f} ms/query")
+    print(f"hierarchy:        {per_query * 1e3:>9.3f} ms/query ({per_dijkstra / per_query:.0f}x)")
+    print(f"break even after: {preprocessing / (per_dijkstra - per_query):>9.0f} queries")
+
+
+if __name__ == '__main__':
+    main()
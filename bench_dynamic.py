@@ -0,0 +1,107 @@
+"""
+Author:
+Nilusink
+
+replanning after single node changes: incremental (DynamicGraph + LPA*)
+against rebuilding the graph and searching again
+"""
+from bench_common import WIDTH, HEIGHT, AVERAGE_DEGREE, node_range_for
+from dynamic_graph import DynamicGraph, LPAStarFinder
+from graph_search import dijkstra
+from neighbors import grid_pairs
+from graph import Graph
+import numpy as np
+import time
+
+
+N_NODES: int = 20_000
+N_CHANGES: int = 200
+
+
+def full_recompute(xy: np.ndarray, node_range: float, origin: int, target: int) -> float:
+    """
+    what it costs today: rebuild the connections, search from scratch
+
+    :return: path length
+    """
+    graph = Graph.from_pairs(xy, *grid_pairs(xy, node_range))
+    distances, _, _ = dijkstra(graph, origin, {target})
+    return float(distances[target])
+
+
+def run(on_path: bool, rng: np.random.Generator) -> None:
+    """
+    :param on_path: always change a node of the current path (worst case),
+        otherwise any node of the graph
+    """
+    xy = np.stack((rng.uniform(0, WIDTH, N_NODES), rng.uniform(0, HEIGHT, N_NODES)), axis=1)
+    node_range = node_range_for(N_NODES)
+
+    graph = DynamicGraph.from_xy(xy, node_range)
+
+    # two nodes far apart
+    origin = int(np.argmin(xy.sum(axis=1)))
+    target = int(np.argmax(xy.sum(axis=1)))
+
+    finder = LPAStarFinder(graph, origin, target)
+    start = time.perf_counter()
+    path = finder.calculate()
+    initial = time.perf_counter() - start
+    initial_expanded = finder.expanded
+
+    incremental: list[float] = []
+    recompute: list[float] = []
+    expanded: list[int] = []
+    for i in range(N_CHANGES):
+        if on_path and path and len(path) > 2:
+            node = path[int(rng.integers(1, len(path) - 1))]
+
+        else:
+            node = int(rng.choice([n for n in graph.positions if n not in (origin, target)]))
+
+        before = finder.expanded
+
+        start = time.perf_counter()
+        match i % 3:
+            case 0:
+                graph.remove_node(node)
+
+            case 1:
+                x, y = graph.positions[node]
+                graph.move_node(node, x + rng.normal(0, node_range / 2), y + rng.normal(0, node_range / 2))
+
+            case 2:
+                x, y = graph.positions[node]
+                graph.add_node(x + rng.normal(0, node_range / 2), y + rng.normal(0, node_range / 2))
+
+        path = finder.calculate()
+        incremental.append(time.perf_counter() - start)
+        expanded.append(finder.expanded - before)
+
+        # reference: same graph, from scratch
+        snapshot, ids = graph.to_graph()
+        index = {node: j for j, node in enumerate(ids)}
+        start = time.perf_counter()
+        length = full_recompute(snapshot.xy, node_range, index[origin], index[target])
+        recompute.append(time.perf_counter() - start)
+
+        lpa_length = sum(graph.weight(a, b) for a, b in zip(path, path[1:])) if path else float("inf")
+        assert abs(lpa_length - length) < 1e-6, (lpa_length, length)
+
+    print(f"{N_CHANGES} single node changes {'on the path' if on_path else 'anywhere'} (remove / move / add)")
+    print(f"  initial LPA* search:  {initial * 1e3:>9.3f} ms, {initial_expanded} expanded")
+    print(f"  incremental replan:   {np.mean(incremental) * 1e3:>9.3f} ms (median {np.median(incremental) * 1e3:.3f} ms), "
+          f"{np.mean(expanded):.0f} expanded")
+    print(f"  rebuild + dijkstra:   {np.mean(recompute) * 1e3:>9.3f} ms")
+    print(f"  speedup:              {np.mean(recompute) / np.mean(incremental):>9.1f}x "
+          f"(median {np.median(recompute) / np.median(incremental):.1f}x)")
+
+
+def main():
+    print(f"graph: {N_NODES} nodes, average degree {AVERAGE_DEGREE}")
+    run(False, np.random.default_rng(0))
+    run(True, np.random.default_rng(0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Author:
+Nilusink
+
+building and drawing all connections (DRAW_ALL_CONNECTIONS): list of
+set pairs and one `pg.draw.line` per edge against the edge array and
+batched drawing (and copying the drawn layer, as main does for a fixed graph)
+
+runs without a window (SDL dummy video driver)
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from bench_common import WIDTH, HEIGHT, generate_nodes, node_range_for
+from render_cache import draw_edges, edge_colors
+from neighbors import build_node_connections
+from classes import Vec2
+from graph import Graph
+import pygame as pg
+import numpy as np
+import time
+
+
+# (nodes, node range): main's defaults and about AVERAGE_DEGREE neighbors
+CASES: list[tuple[int, float]] = [
+    (500, 150),
+    (1_000, 150),
+    (1_000, node_range_for(1_000)),
+    (2_000, node_range_for(2_000)),
+    (20_000, node_range_for(20_000)),
+]
+MAX_OLD_BUILD: int = 2_000  # the old build is quadratic
+
+
+def graph_nodes(n: int, node_range: float) -> dict[Vec2, list]:
+    rng = np.random.default_rng(0)
+    nodes = generate_nodes(n, rng)
+
+    return build_node_connections(nodes, node_range)
+
+
+def old_build(node_connections: dict[Vec2, list]) -> list[set]:
+    paths: list[set] = []
+    for node, in_range in node_connections.items():
+        for other_node in in_range:
+            pair = {node, other_node}
+            if pair not in paths:
+                paths.append(pair)
+
+    return paths
+
+
+def old_draw(surface: pg.Surface, paths: list[set], node_range: float) -> None:
+    for connection in paths:
+        connection = list(connection)
+        quality = 1 - ((connection[0] - connection[1]).length / node_range)
+        pg.draw.line(surface, (255 * (1 - quality), 255 * quality, 0), connection[0].xy, connection[1].xy)
+
+
+def main():
+    pg.init()
+    pg.display.set_mode((WIDTH, HEIGHT))
+    surface = pg.Surface((WIDTH, HEIGHT))
+
+    for n, node_range in CASES:
+        node_connections = graph_nodes(n, node_range)
+
+        start = time.perf_counter()
+        graph, _ = Graph.from_node_connections(node_connections)
+        edges, lengths = graph.undirected_edges()
+        buckets, palette = edge_colors(lengths, node_range)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        draw_edges(surface, graph.xy, edges, buckets, palette)
+        draw = time.perf_counter() - start
+
+        # a fixed graph (main with GRAPH_FILE) is drawn once and then copied
+        layer = surface.copy()
+        start = time.perf_counter()
+        surface.blit(layer, (0, 0))
+        blit = time.perf_counter() - start
+
+        # the old version builds the same (unordered) pairs
+        nodes = list(node_connections)
+        paths = [{nodes[a], nodes[b]} for a, b in edges.tolist()]
+
+        old_build_time = None
+        if n <= MAX_OLD_BUILD:
+            start = time.perf_counter()
+            old_paths = old_build(node_connections)
+            old_build_time = time.perf_counter() - start
+            assert len(old_paths) == len(edges)
+
+        start = time.perf_counter()
+        old_draw(surface, paths, node_range)
+        old_draw_time = time.perf_counter() - start
+
+        old = f"{old_build_time * 1e3:>9.1f} ms" if old_build_time is not None else f"{'-':>12}"
+        print(f"{n} nodes, range {node_range:.0f}, {len(edges)} connections")
+        print(f"  build:  old {old}   new {build * 1e3:>7.1f} ms")
+        print(f"  draw:   old {old_draw_time * 1e3:>9.1f} ms   new {draw * 1e3:>7.1f} ms   cached {blit * 1e3:>5.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
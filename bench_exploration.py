@@ -0,0 +1,102 @@
+"""
+Author:
+Nilusink
+
+compare `exploration.explore` with the recursive `request_all`
+that `AllKnowing` used before
+"""
+from bench_common import node_range_for, random_xy
+from exploration import explore
+from neighbors import grid_pairs
+from graph import Graph
+import numpy as np
+import time
+import sys
+
+
+RECURSIVE_MAX_NODES: int = 10_000
+
+
+def request_all_recursive(requester, visible_nodes: list, to_append: dict, origin, ignore: list = ..., n=0) -> None:
+    """
+    the original recursive version
+    """
+    if ignore is ...:
+        ignore = []
+
+    ignore.append(origin)
+    if origin not in visible_nodes:
+        visible_nodes.append(origin)
+
+    points = requester(origin)
+
+    for point in points:
+        if point not in visible_nodes:
+            visible_nodes.append(point)
+
+        if point not in to_append:
+            to_append[point] = {
+                "name": point,
+                "hops": n+1,
+                "connections": [],
+            }
+    if origin in to_append:
+        to_append[origin]["connections"] = points
+
+    for point in points:
+        if point not in ignore:
+            request_all_recursive(requester, visible_nodes, to_append, point, ignore, n+1)
+
+
+def random_graph(n: int, rng: np.random.Generator) -> Graph:
+    xy = random_xy(n, rng)
+    node_range = node_range_for(n)
+    return Graph.from_pairs(xy, *grid_pairs(xy, node_range))
+
+
+def chain(n: int) -> dict[int, list[int]]:
+    """
+    a single long path, the worst case for recursion depth
+    """
+    return {i: [j for j in (i - 1, i + 1) if 0 <= j < n] for i in range(n)}
+
+
+def timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    sys.setrecursionlimit(RECURSIVE_MAX_NODES * 10)
+
+    print(f"{'graph':<12} {'nodes':>9} {'recursive':>10} {'set':>9} {'bitmap':>9}")
+    for n in (1_000, 5_000, 10_000, 100_000, 1_000_000):
+        graph = random_graph(n, rng)
+        requester = graph.adjacency().__getitem__
+
+        recursive = "-"
+        if n <= RECURSIVE_MAX_NODES:
+            recursive = f"{timed(request_all_recursive, requester, [], {}, 0):.3f}s"
+
+        t_set = timed(explore, 0, requester, {}, [])
+        t_bitmap = timed(explore, 0, requester, {}, [], n_nodes=n)
+
+        print(f"{'geometric':<12} {n:>9} {recursive:>10} {t_set:>8.3f}s {t_bitmap:>8.3f}s")
+
+    for n in (1_000, 5_000, 1_000_000):
+        connections = chain(n)
+
+        recursive = "-"
+        if n <= RECURSIVE_MAX_NODES:
+            recursive = f"{timed(request_all_recursive, connections.__getitem__, [], {}, 0):.3f}s"
+
+        t_set = timed(explore, 0, connections.__getitem__, {}, [])
+        t_bitmap = timed(explore, 0, connections.__getitem__, {}, [], n_nodes=n)
+
+        print(f"{'chain':<12} {n:>9} {recursive:>10} {t_set:>8.3f}s {t_bitmap:>8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
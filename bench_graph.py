@@ -0,0 +1,64 @@
+"""
+Author:
+Nilusink
+
+compare the memory used by the `dict[Vec2, list[Vec2]]` graph with the
+CSR `Graph` at about 1M (directed) edges
+"""
+from bench_common import node_range_for, random_xy
+from neighbors import build_node_connections
+from classes import Vec2
+from graph import Graph
+import numpy as np
+import tracemalloc
+
+
+N_NODES: int = 60_000
+
+
+def traced(func, *args) -> tuple[int, object]:
+    """
+    :return: (bytes allocated by func that are still alive, result)
+    """
+    tracemalloc.start()
+    res = func(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return size, res
+
+
+def dict_graph(xs: np.ndarray, ys: np.ndarray, node_range: float) -> dict[Vec2, list]:
+    nodes = [Vec2.from_cartesian(xs[i], ys[i]) for i in range(len(xs))]
+    return build_node_connections(nodes, node_range)
+
+
+def csr_graph(xs: np.ndarray, ys: np.ndarray, node_range: float) -> Graph:
+    nodes = [Vec2.from_cartesian(xs[i], ys[i]) for i in range(len(xs))]
+    graph = Graph.from_nodes(nodes, node_range)
+
+    # only the graph is kept around
+    del nodes
+    return graph
+
+
+def main():
+    rng = np.random.default_rng(0)
+    xs, ys = random_xy(N_NODES, rng).T
+    node_range = node_range_for(N_NODES)
+
+    dict_size, connections = dict_graph_res = traced(dict_graph, xs, ys, node_range)
+    n_edges = sum(len(c) for c in connections.values())
+    del connections, dict_graph_res
+
+    csr_size, graph = traced(csr_graph, xs, ys, node_range)
+
+    print(f"nodes: {N_NODES}, directed edges: {n_edges} ({graph.n_edges})")
+    print(f"dict[Vec2, list]: {dict_size / 1e6:>8.1f} MB  ({dict_size / n_edges:>6.1f} B/edge)")
+    print(f"Graph (CSR):      {csr_size / 1e6:>8.1f} MB  ({csr_size / n_edges:>6.1f} B/edge)")
+    print(f"Graph.nbytes:     {graph.nbytes / 1e6:>8.1f} MB")
+    print(f"reduction:        {dict_size / csr_size:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
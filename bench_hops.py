@@ -0,0 +1,87 @@
+"""
+Author:
+Nilusink
+
+layers from the target (`AllKnowing.request_from_target`): node by node
+with a list of known nodes (the old version), node by node with a set
+and `graph_search.bfs_layers` on the CSR arrays
+"""
+from bench_common import generate_nodes, node_range_for
+from path_finders import AllKnowing
+from graph_search import bfs_layers
+from renderers import NullRenderer
+from graph import Graph
+import numpy as np
+import time
+
+
+SIZES: list[int] = [5_000, 20_000, 100_000]
+MAX_OLD: int = 20_000  # the old version is quadratic
+MAX_ITERATIONS: int = 300
+
+
+def old_layers(requester, target: int, origin: int, max_iterations: int) -> dict[int, list[int]]:
+    """
+    the layer loop `request_from_target` used before
+    """
+    layers = {0: [target]}
+    all_points = [target]
+    current_layer = 0
+    while current_layer < max_iterations:
+        if origin in layers[current_layer]:
+            break
+
+        layers[current_layer + 1] = []
+        for node in layers[current_layer]:
+            new_nodes = list(filter(lambda e: e not in all_points, requester(node)))
+            layers[current_layer + 1] += new_nodes
+            all_points += new_nodes
+
+        current_layer += 1
+
+    return layers
+
+
+def timed(func, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    res = func(*args)
+    return time.perf_counter() - start, res
+
+
+def main():
+    for n in SIZES:
+        rng = np.random.default_rng(0)
+        nodes = generate_nodes(n, rng)
+        node_range = node_range_for(n)
+        graph = Graph.from_nodes(nodes, node_range)
+
+        # opposite corners, so the layers cover most of the graph
+        target = int(np.argmin(graph.xy.sum(axis=1)))
+        origin = int(np.argmax(graph.xy.sum(axis=1)))
+
+        adjacency = graph.adjacency()
+        finder = AllKnowing(adjacency, [], 0, None, None, adjacency.__getitem__, renderer=NullRenderer())
+
+        loop_time, expected = timed(finder.requested_layers, target, origin, MAX_ITERATIONS)
+        finder.graph = graph
+        array_time, layers = timed(finder.graph_layers, target, origin, MAX_ITERATIONS)
+        engine_time, (hops, _) = timed(bfs_layers, graph, target, origin, MAX_ITERATIONS + 1)
+
+        # the loop adds empty layers up to max_iterations if origin isn't reachable
+        assert layers == {hops: layer for hops, layer in expected.items() if layer}
+        for layer, layer_nodes in layers.items():
+            assert (hops[layer_nodes] == layer).all()
+
+        print(f"{n} nodes, {graph.n_edges} directed edges, {len(layers)} layers, {sum(map(len, layers.values()))} nodes reached")
+        if n <= MAX_OLD:
+            old_time, old = timed(old_layers, adjacency.__getitem__, target, origin, MAX_ITERATIONS)
+            assert old == expected
+            print(f"  old (list):      {old_time * 1e3:>9.1f} ms")
+
+        print(f"  node by node:    {loop_time * 1e3:>9.1f} ms")
+        print(f"  bfs_layers:      {engine_time * 1e3:>9.1f} ms ({loop_time / engine_time:.0f}x)")
+        print(f"  graph_layers:    {array_time * 1e3:>9.1f} ms (bfs_layers + lists)")
+
+
+if __name__ == '__main__':
+    main()
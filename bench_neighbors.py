@@ -0,0 +1,70 @@
+"""
+Author:
+Nilusink
+
+compare the neighbor construction in `neighbors` against the
+original nested loop from `main.recalculate`
+"""
+from bench_common import generate_nodes
+from neighbors import build_node_connections, grid_pairs
+from classes import Vec2
+import numpy as np
+import time
+
+
+NODE_RANGE: float = 150
+LOOP_MAX_NODES: int = 2_000
+
+
+def loop_connections(nodes: list[Vec2], node_range: float) -> dict[Vec2, list]:
+    """
+    the original O(n²) loop
+    """
+    node_connections: dict[Vec2, list] = {}
+    for node in nodes:
+        in_range: list[Vec2] = []
+
+        for other_node in nodes:
+            if not other_node == node:
+                if (node - other_node).length <= node_range:
+                    in_range.append(other_node)
+
+        node_connections[node] = in_range
+
+    return node_connections
+
+
+def timed(func, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    res = func(*args)
+    return time.perf_counter() - start, res
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    print(f"{'nodes':>9} {'range':>7} {'loop':>9} {'grid dict':>10} {'grid pairs':>11} {'speedup':>8}")
+    for n in (500, 1_000, 2_000, 10_000, 100_000, 1_000_000):
+        # keep the average degree the same as with 500 nodes
+        node_range = min(NODE_RANGE, NODE_RANGE * (500 / n) ** .5)
+
+        nodes = generate_nodes(n, rng)
+
+        t_dict, grid_res = timed(build_node_connections, nodes, node_range)
+        xy = np.array([node.xy for node in nodes], dtype=np.float64)
+        t_pairs, _ = timed(grid_pairs, xy, node_range)
+
+        loop_col = speedup_col = "-"
+        if n <= LOOP_MAX_NODES:
+            t_loop, loop_res = timed(loop_connections, nodes, node_range)
+            loop_col = f"{t_loop:.3f}s"
+            speedup_col = f"{t_loop / t_dict:.1f}x"
+
+            # make sure both produce the same connections
+            assert all(loop_res[node] == grid_res[node] for node in nodes)
+
+        print(f"{n:>9} {node_range:>7.1f} {loop_col:>9} {t_dict:>9.3f}s {t_pairs:>10.3f}s {speedup_col:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Author:
+Nilusink
+
+repeated queries towards a few popular targets, with and without the
+shortest path tree cache
+"""
+from bench_common import node_range_for, random_xy
+from query_cache import ShortestPathTreeCache
+from graph_search import dijkstra, unwind
+from neighbors import grid_pairs
+from graph import Graph
+import numpy as np
+import time
+
+
+N_NODES: int = 100_000
+N_QUERIES: int = 1_000
+N_TARGETS: int = 10
+
+
+def main():
+    rng = np.random.default_rng(0)
+    xy = random_xy(N_NODES, rng)
+    node_range = node_range_for(N_NODES)
+    graph = Graph.from_pairs(xy, *grid_pairs(xy, node_range))
+
+    targets = rng.choice(N_NODES, N_TARGETS, replace=False)
+    queries = [(int(rng.integers(N_NODES)), int(rng.choice(targets))) for _ in range(N_QUERIES)]
+
+    # without cache: one (early stopping) search per query, only a few for time reasons
+    n_uncached = 20
+    start = time.perf_counter()
+    for origin, target in queries[:n_uncached]:
+        _, parents, settled = dijkstra(graph, target, {origin})
+        if settled[origin]:
+            unwind(parents, origin)
+
+    uncached = (time.perf_counter() - start) / n_uncached
+
+    cache = ShortestPathTreeCache(graph, memory_budget=N_TARGETS * N_NODES * 13)
+    start = time.perf_counter()
+    for origin, target in queries:
+        cache.path(origin, target)
+
+    cached = (time.perf_counter() - start) / N_QUERIES
+
+    # once all trees are built
+    start = time.perf_counter()
+    for origin, target in queries:
+        cache.path(origin, target)
+
+    warm = (time.perf_counter() - start) / N_QUERIES
+
+    print(f"graph: {N_NODES} nodes, {graph.n_edges} directed edges, {N_QUERIES} queries to {N_TARGETS} targets")
+    print(f"no cache:         {uncached * 1e3:>9.3f} ms/query")
+    print(f"cache (cold):     {cached * 1e3:>9.3f} ms/query")
+    print(f"cache (warm):     {warm * 1e3:>9.3f} ms/query")
+    print(f"cache: {cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
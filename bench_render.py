@@ -0,0 +1,122 @@
+"""
+Author:
+Nilusink
+
+frames per second of the animated search: redrawing everything on every
+step against the cached background with dirty rects
+
+runs without a window (SDL dummy video driver)
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from bench_common import WIDTH, HEIGHT, generate_nodes, node_range_for
+from neighbors import build_node_connections
+from path_finders import DijkstraFinder
+import path_finders
+from render_cache import RenderCache
+from renderers import PygameRenderer
+from classes import Vec2
+import pygame as pg
+import numpy as np
+import time
+
+
+N_NODES: int = 10_000
+FRAMES: int = 1_000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    nodes = generate_nodes(N_NODES, rng)
+    node_range = node_range_for(N_NODES)
+    node_connections = build_node_connections(nodes, node_range)
+    edges = {(a, b) for a, others in node_connections.items() for b in others if id(a) < id(b)}
+    origin, target = nodes[0], nodes[1]
+
+    pg.init()
+    screen = pg.display.set_mode((WIDTH, HEIGHT))
+
+    def draw_connections(surface: pg.Surface):
+        for a, b in edges:
+            quality = 1 - (a - b).length / node_range
+            pg.draw.line(surface, (255 * (1 - quality), 255 * quality, 0), a.xy, b.xy)
+
+    def draw_node(surface: pg.Surface, node: Vec2) -> pg.Rect:
+        return pg.draw.circle(surface, (255, 255, 255), node.xy, 5)
+
+    path_finders.DRAW_STEPS = True
+
+    def run(visible_nodes: list[Vec2], redraw, draw_path, flip, max_frames: int) -> float:
+        """
+        :return: frames per second
+        """
+        frames = 0
+
+        def counted_flip():
+            nonlocal frames
+            frames += 1
+            flip()
+            if frames >= max_frames:
+                raise StopIteration
+
+        finder = DijkstraFinder(
+            node_connections,
+            visible_nodes,
+            0,
+            None,
+            None,
+            node_connections.__getitem__,
+            renderer=PygameRenderer(redraw, draw_path, counted_flip),
+        )
+
+        start = time.perf_counter()
+        try:
+            finder.calculate(origin, target)
+
+        except StopIteration:
+            pass
+
+        return frames / (time.perf_counter() - start)
+
+    # everything on every frame
+    visible_nodes: list[Vec2] = [origin]
+
+    def redraw():
+        screen.fill((0, 0, 0))
+        draw_connections(screen)
+        for node in visible_nodes:
+            draw_node(screen, node)
+
+    def draw_path(path, color=(0, 0, 255)):
+        for i in range(len(path)):
+            if i != len(path) - 1:
+                pg.draw.line(screen, color, path[i].xy, path[i + 1].xy, width=2)
+
+            pg.draw.circle(screen, (0, 50, 0), path[i].xy, node_range, width=1)
+
+    # only a few frames for time reasons
+    full = run(visible_nodes, redraw, draw_path, pg.display.flip, 20)
+
+    # cached background
+    visible_nodes = [origin]
+    start = time.perf_counter()
+    cache = RenderCache(screen, draw_connections, draw_node, visible_nodes)
+    setup = time.perf_counter() - start
+
+    def cached_draw_path(path, color=(0, 0, 255)):
+        for i in range(len(path)):
+            if i != len(path) - 1:
+                cache.draw(pg.draw.line, color, path[i].xy, path[i + 1].xy, width=2)
+
+            cache.draw(pg.draw.circle, (0, 50, 0), path[i].xy, node_range, width=1)
+
+    cached = run(visible_nodes, cache.redraw, cached_draw_path, cache.flip, FRAMES)
+
+    print(f"graph: {N_NODES} nodes, {len(edges)} connections, all connections drawn")
+    print(f"full redraw:        {full:>8.1f} fps")
+    print(f"cached background:  {cached:>8.1f} fps ({cached / full:.0f}x), {setup * 1e3:.0f} ms to draw the background once")
+
+
+if __name__ == '__main__':
+    main()
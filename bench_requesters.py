@@ -0,0 +1,57 @@
+"""
+Author:
+Nilusink
+
+AllKnowing / AllKnowing2 on a source with simulated latency: one round
+trip per requested node against the caching, batching requester
+"""
+from bench_common import generate_nodes
+from requesters import CachingRequester, LatencySource
+from path_finders import AllKnowing, AllKnowing2
+from neighbors import build_node_connections
+from renderers import NullRenderer
+import numpy as np
+import time
+
+
+N_NODES: int = 1_000
+NODE_RANGE: float = 100
+LATENCY: float = .0005
+N_QUERIES: int = 3
+
+
+def run(finder_type: type, node_connections: dict, requester, queries: list) -> tuple[list, float]:
+    finder = finder_type(node_connections, [], 0, None, None, requester, renderer=NullRenderer())
+
+    start = time.perf_counter()
+    paths = [finder.calculate(origin, target) for origin, target in queries]
+    return paths, (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    nodes = generate_nodes(N_NODES, rng)
+    node_connections = build_node_connections(nodes, NODE_RANGE)
+    queries = [(nodes[i], nodes[j]) for i, j in rng.choice(N_NODES, (N_QUERIES, 2))]
+
+    print(f"graph: {N_NODES} nodes, latency {LATENCY * 1e3:.1f} ms per round trip, {N_QUERIES} queries")
+    for finder_type in (AllKnowing, AllKnowing2):
+        # a plain function hides `request_many`, every node is its own round trip
+        source = LatencySource(node_connections, LATENCY)
+        expected, per_node = run(finder_type, node_connections, lambda node: source(node), queries)
+        direct_trips = source.round_trips
+
+        source = LatencySource(node_connections, LATENCY)
+        paths, cached = run(finder_type, node_connections, CachingRequester(source), queries)
+        assert paths == expected
+
+        print(f"{finder_type.__name__}")
+        print(f"  per node:  {direct_trips / N_QUERIES:>8.0f} round trips/query {per_node * 1e3:>9.1f} ms/query")
+        print(
+            f"  cached:    {source.round_trips / N_QUERIES:>8.0f} round trips/query {cached * 1e3:>9.1f} ms/query "
+            f"({direct_trips / source.round_trips:.0f}x fewer round trips)"
+        )
+
+
+if __name__ == '__main__':
+    main()
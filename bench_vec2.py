@@ -0,0 +1,39 @@
+"""
+Author:
+Nilusink
+
+per-operation cost of `Vec2`
+"""
+from classes import Vec2
+import timeit
+
+
+N: int = 200_000
+
+
+def main():
+    a = Vec2.from_cartesian(3, 4)
+    b = Vec2.from_cartesian(-1, 7.5)
+
+    operations = {
+        "from_cartesian": lambda: Vec2.from_cartesian(3, 4),
+        "from_polar": lambda: Vec2.from_polar(1, 5),
+        "a + b": lambda: a + b,
+        "a - b": lambda: a - b,
+        "a * 2": lambda: a * 2,
+        "a / 2": lambda: a / 2,
+        "(a - b).length": lambda: (a - b).length,
+        "a.length": lambda: a.length,
+        "a.angle": lambda: a.angle,
+        "a.x = 1": lambda: setattr(a, "x", 1),
+        "a.copy()": lambda: a.copy(),
+        "abs(a)": lambda: abs(a),
+    }
+
+    for name, func in operations.items():
+        t = min(timeit.repeat(func, number=N, repeat=5)) / N
+        print(f"{name:<16} {t * 1e9:>8.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
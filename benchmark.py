@@ -0,0 +1,256 @@
+"""
+Author:
+Nilusink
+
+non-interactive benchmark of all registered finders over graph sizes,
+node ranges and seeds
+
+usage:
+    python benchmark.py --sizes 500 1000 2000 --ranges 150 100 --seeds 0 1 2 --out results.json
+    python benchmark.py --graph graph.bin --seeds 0 1 2
+"""
+from path_finders import FINDERS, AStarFinder, path_length
+from neighbors import build_node_connections
+from graph_file import load_graph, read_header
+from renderers import NullRenderer
+from results import RecordSink
+from search_stats import PHASES, SearchStats
+from classes import Vec2
+import numpy as np
+import argparse
+import json
+import time
+import csv
+
+
+WIDTH: int = 1920
+HEIGHT: int = 1080
+SIZES: list[int] = [500, 1_000, 2_000, 5_000]
+RANGES: list[float] = [150, 100]
+SEEDS: list[int] = [0, 1, 2, 3, 4]
+
+FIELDS: list[str] = [
+    "finder", "n", "node_range", "seed", "found", "time", "length", "optimum", "ratio", "win",
+    "expanded", "requests", "frontier_peak", "sorts", *(f"time_{name}" for name in PHASES), "peak_memory",
+]
+
+
+def generate_nodes(n: int, rng: np.random.Generator) -> list[Vec2]:
+    """
+    same distribution as `main.generate_nodes`, but seeded
+    """
+    xs = rng.integers(0, WIDTH, n).tolist()
+    ys = rng.integers(0, HEIGHT, n).tolist()
+
+    return [Vec2.from_cartesian(xs[i], ys[i]) for i in range(n)]
+
+
+def run_finder(
+        finder_type: type,
+        node_connections: dict[Vec2, list],
+        origin: Vec2,
+        target: Vec2,
+        stats: SearchStats | None = ...,
+) -> tuple[list[Vec2] | None, SearchStats | None]:
+    """
+    :param stats: a new `SearchStats` by default, None for an uninstrumented run
+    """
+    if stats is ...:
+        stats = SearchStats()
+
+    finder = finder_type(
+        node_connections,
+        [],
+        0,
+        None,
+        None,
+        node_connections.__getitem__,
+        renderer=NullRenderer(),
+        stats=stats,
+    )
+
+    return finder.calculate(origin, target), stats
+
+
+def run_trial(
+        n: int,
+        node_range: float,
+        seed: int,
+        finders: dict[str, type],
+        measure_memory: bool = True,
+        node_connections: dict[Vec2, list] = ...,
+) -> list[dict]:
+    """
+    generate one graph and run every finder on the same (origin, target) pair
+
+    :param node_connections: use this graph instead of generating one
+        (n and node_range are only recorded)
+    :return: one record per finder
+    """
+    rng = np.random.default_rng(seed)
+    if node_connections is ...:
+        nodes = generate_nodes(n, rng)
+        node_connections = build_node_connections(nodes, node_range)
+
+    else:
+        nodes = list(node_connections)
+
+    origin, target = (nodes[i] for i in rng.choice(len(nodes), 2, replace=False))
+
+    # exact shortest path as reference
+    optimal, _ = run_finder(AStarFinder, node_connections, origin, target, None)
+    optimum = path_length(optimal) if optimal else None
+
+    records: list[dict] = []
+    for name, finder_type in finders.items():
+        # timed without instrumentation, the counters come from a second run
+        start = time.perf_counter()
+        path, _ = run_finder(finder_type, node_connections, origin, target, None)
+        duration = time.perf_counter() - start
+
+        _, stats = run_finder(finder_type, node_connections, origin, target)
+
+        # memory is measured in a separate run, tracemalloc slows everything down
+        if measure_memory:
+            memory_stats = SearchStats()
+            with memory_stats.track_memory():
+                run_finder(finder_type, node_connections, origin, target, memory_stats)
+
+            stats.peak_memory = memory_stats.peak_memory
+
+        length = path_length(path) if path else None
+        records.append({
+            "finder": name,
+            "n": n,
+            "node_range": node_range,
+            "seed": seed,
+            "found": path is not None,
+            "time": duration,
+            "length": length,
+            "optimum": optimum,
+            "ratio": length / optimum if length is not None and optimum else None,
+            **stats.as_record(),
+        })
+
+    # shortest path of the trial
+    shortest = min((r["length"] for r in records if r["found"]), default=None)
+    for record in records:
+        record["win"] = record["found"] and record["length"] == shortest
+
+    return records
+
+
+def run_benchmark(
+        sizes: list[int],
+        ranges: list[float],
+        seeds: list[int],
+        finders: dict[str, type],
+        measure_memory: bool = True,
+) -> list[dict]:
+    records: list[dict] = []
+    for n in sizes:
+        for node_range in ranges:
+            for seed in seeds:
+                records += run_trial(n, node_range, seed, finders, measure_memory)
+
+    return records
+
+
+def write_records(records: list[dict], path: str) -> None:
+    """
+    write as json, binary records (.bin, see results.py) or csv, depending
+    on the file extension
+    """
+    if path.endswith(".bin"):
+        with RecordSink(path, append=False) as sink:
+            sink.write_many(records)
+
+        return
+
+    if path.endswith(".json"):
+        with open(path, "w") as out:
+            json.dump(records, out, indent=1)
+
+        return
+
+    with open(path, "w", newline="") as out:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def summary(records: list[dict]) -> str:
+    """
+    per finder and graph size: mean time, queries per second, path quality
+    and how the time grows with n (exponent of a power law fit)
+    """
+    lines = [
+        f"{'finder':<20} {'n':>8} {'runs':>5} {'found':>6} {'mean time':>11} {'queries/s':>10} "
+        f"{'expanded':>9} {'requests':>9} {'frontier':>9} {'length/opt':>11} {'peak mem':>10}",
+    ]
+
+    finders = list(dict.fromkeys(r["finder"] for r in records))
+    for finder in finders:
+        f_records = [r for r in records if r["finder"] == finder]
+        sizes = sorted(set(r["n"] for r in f_records))
+
+        mean_times: list[float] = []
+        for n in sizes:
+            runs = [r for r in f_records if r["n"] == n]
+            found = [r for r in runs if r["found"]]
+            ratios = [r["ratio"] for r in found if r["ratio"] is not None]
+            memory = [r["peak_memory"] for r in runs if r["peak_memory"] is not None]
+
+            mean_time = float(np.mean([r["time"] for r in runs]))
+            mean_times.append(mean_time)
+
+            ratio = f"{np.mean(ratios):.3f}" if ratios else "-"
+            peak = f"{np.max(memory) / 1e6:.1f} MB" if memory else "-"
+            lines.append(
+                f"{finder:<20} {n:>8} {len(runs):>5} {len(found):>6} {mean_time * 1e3:>8.2f} ms "
+                f"{1 / mean_time:>10.1f} {np.mean([r['expanded'] for r in runs]):>9.0f} "
+                f"{np.mean([r['requests'] for r in runs]):>9.0f} {np.mean([r['frontier_peak'] for r in runs]):>9.0f} "
+                f"{ratio:>11} {peak:>10}"
+            )
+
+        if len(sizes) > 1:
+            exponent = np.polyfit(np.log(sizes), np.log(mean_times), 1)[0]
+            lines.append(f"{finder:<20} time ~ n^{exponent:.2f}")
+
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark all registered path finders")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="number of nodes")
+    parser.add_argument("--ranges", type=float, nargs="+", default=RANGES, help="node ranges")
+    parser.add_argument("--seeds", type=int, nargs="+", default=SEEDS, help="rng seeds")
+    parser.add_argument("--finders", nargs="+", default=list(FINDERS), choices=list(FINDERS))
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--out", help="write all records to a .json, .bin or .csv file")
+    parser.add_argument("--graph", help="run on the graph in this file (see graph_file.py), ignores sizes and ranges")
+    args = parser.parse_args()
+
+    finders = {name: FINDERS[name] for name in args.finders}
+
+    if args.graph:
+        # the Vec2 finders need the whole graph in memory, the file is only read once
+        node_connections = load_graph(args.graph).to_node_connections()
+        node_range = read_header(args.graph)["node_range"]
+        records = []
+        for seed in args.seeds:
+            records += run_trial(len(node_connections), node_range, seed, finders, not args.no_memory, node_connections)
+
+    else:
+        records = run_benchmark(args.sizes, args.ranges, args.seeds, finders, not args.no_memory)
+
+    if args.out:
+        write_records(records, args.out)
+
+    print(summary(records))
+
+
+if __name__ == '__main__':
+    main()
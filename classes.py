@@ -12,47 +12,54 @@ class Vec2:
     angle: float
     length: float
 
+    # cartesian coordinates are always set, polar coordinates
+    # are only calculated when they are first needed (None = unknown)
+    __slots__ = ("_x", "_y", "_angle", "_length")
+
     def __init__(self) -> None:
-        self.__x: float = 0
-        self.__y: float = 0
-        self.__angle: float = 0
-        self.__length: float = 0
+        self._x: float = 0
+        self._y: float = 0
+        self._angle: float | None = 0
+        self._length: float | None = 0
 
     # variable getters / setters
     @property
     def x(self):
-        return self.__x
+        return self._x
 
     @x.setter
     def x(self, value):
-        self.__x = value
-        self.__update("c")
+        self._x = value
+        self._angle = self._length = None
 
     @property
     def y(self):
-        return self.__y
+        return self._y
 
     @y.setter
     def y(self, value):
-        self.__y = value
-        self.__update("c")
+        self._y = value
+        self._angle = self._length = None
 
     @property
     def xy(self):
-        return self.__x, self.__y
+        return self._x, self._y
 
     @xy.setter
     def xy(self, xy):
-        self.__x = xy[0]
-        self.__y = xy[1]
-        self.__update("c")
+        self._x = xy[0]
+        self._y = xy[1]
+        self._angle = self._length = None
 
     @property
     def angle(self):
         """
         value in radian
         """
-        return self.__angle
+        if self._angle is None:
+            self._angle = m.atan2(self._y, self._x)
+
+        return self._angle
 
     @angle.setter
     def angle(self, value):
@@ -61,27 +68,29 @@ class Vec2:
         """
         value = self.normalize_angle(value)
 
-        self.__angle = value
-        self.__update("p")
+        self.polar = value, self.length
 
     @property
     def length(self):
-        return self.__length
+        if self._length is None:
+            self._length = m.sqrt(self._x**2 + self._y**2)
+
+        return self._length
 
     @length.setter
     def length(self, value):
-        self.__length = value
-        self.__update("p")
+        self.polar = self.angle, value
 
     @property
     def polar(self):
-        return self.__angle, self.__length
+        return self.angle, self.length
 
     @polar.setter
     def polar(self, polar):
-        self.__angle = polar[0]
-        self.__length = polar[1]
-        self.__update("p")
+        self._angle = polar[0]
+        self._length = polar[1]
+        self._x = m.cos(self._angle) * self._length
+        self._y = m.sin(self._angle) * self._length
 
     # interaction
     def split_vector(self, direction):
@@ -90,13 +99,13 @@ class Vec2:
         :return: tuple[Vector in only that direction, everything else]
         """
         a = (direction.angle - self.angle)
-        facing = Vec2.from_polar(angle=direction.angle, length=self.length * np.cos(a))
-        other = Vec2.from_polar(angle=direction.angle - np.pi / 2, length=self.length * np.sin(a))
+        facing = Vec2.from_polar(angle=direction.angle, length=self.length * m.cos(a))
+        other = Vec2.from_polar(angle=direction.angle - m.pi / 2, length=self.length * m.sin(a))
 
         return facing, other
 
     def copy(self):
-        return Vec2().from_cartesian(x=self.x, y=self.y)
+        return Vec2._from_xy(self._x, self._y)
 
     def to_dict(self) -> dict:
         return {
@@ -111,51 +120,34 @@ class Vec2:
         return self
 
     def mirror(self, mirror_by: "Vec2") -> "Vec2":
-        mirror_by = mirror_by.copy()
         ang_d = mirror_by.angle - self.angle
         self.angle = self.normalize_angle(self.angle - 2 * ang_d)
         return self
 
     # maths
     def __add__(self, other):
-        if issubclass(type(other), Vec2):
-            return Vec2.from_cartesian(x=self.x + other.x, y=self.y + other.y)
+        if isinstance(other, Vec2):
+            return Vec2._from_xy(self._x + other._x, self._y + other._y)
 
-        return Vec2.from_cartesian(x=self.x + other, y=self.y + other)
+        return Vec2._from_xy(self._x + other, self._y + other)
 
     def __sub__(self, other):
-        if issubclass(type(other), Vec2):
-            return Vec2.from_cartesian(x=self.x - other.x, y=self.y - other.y)
+        if isinstance(other, Vec2):
+            return Vec2._from_xy(self._x - other._x, self._y - other._y)
 
-        return Vec2.from_cartesian(x=self.x - other, y=self.y - other)
+        return Vec2._from_xy(self._x - other, self._y - other)
 
     def __mul__(self, other):
-        if issubclass(type(other), Vec2):
-            return Vec2.from_cartesian(self.x * other.x, self.y * other.y)
+        if isinstance(other, Vec2):
+            return Vec2._from_xy(self._x * other._x, self._y * other._y)
 
-        return Vec2.from_cartesian(x=self.x * other, y=self.y * other)
+        return Vec2._from_xy(self._x * other, self._y * other)
 
     def __truediv__(self, other):
-        return Vec2.from_cartesian(x=self.x / other, y=self.y / other)
-
-    # internal functions
-    def __update(self, calc_from):
-        """
-        :param calc_from: polar (p) | cartesian (c)
-        """
-        if calc_from in ("p", "polar"):
-            self.__x = np.cos(self.angle) * self.length
-            self.__y = np.sin(self.angle) * self.length
-
-        elif calc_from in ("c", "cartesian"):
-            self.__length = m.sqrt(self.x**2 + self.y**2)
-            self.__angle = np.arctan2(self.y, self.x)
-
-        else:
-            raise ValueError("Invalid value for \"calc_from\"")
+        return Vec2._from_xy(self._x / other, self._y / other)
 
     def __abs__(self):
-        return np.sqrt(self.x**2 + self.y**2)
+        return m.sqrt(self._x**2 + self._y**2)
 
     def __repr__(self):
         # return f"<\n" \
@@ -168,15 +160,24 @@ class Vec2:
     # static methods.
     # creation of new instances
     @staticmethod
-    def from_cartesian(x, y) -> "Vec2":
-        p = Vec2()
-        p.xy = x, y
+    def _from_xy(x, y) -> "Vec2":
+        """
+        create a new instance without going through the setters
+        """
+        p = Vec2.__new__(Vec2)
+        p._x = x
+        p._y = y
+        p._angle = p._length = None
 
         return p
 
+    @staticmethod
+    def from_cartesian(x, y) -> "Vec2":
+        return Vec2._from_xy(x, y)
+
     @staticmethod
     def from_polar(angle, length) -> "Vec2":
-        p = Vec2()
+        p = Vec2.__new__(Vec2)
         p.polar = angle, length
 
         return p
@@ -194,10 +195,177 @@ class Vec2:
 
     @staticmethod
     def normalize_angle(value: float) -> float:
-        while value > 2 * np.pi:
-            value -= 2 * np.pi
+        while value > 2 * m.pi:
+            value -= 2 * m.pi
 
         while value < 0:
-            value += 2 * np.pi
+            value += 2 * m.pi
 
         return value
+
+
+class Vec2Array:
+    """
+    a batch of vectors, x and y are stored as contiguous float arrays
+    """
+    x: np.ndarray
+    y: np.ndarray
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: np.ndarray = ..., y: np.ndarray = ...) -> None:
+        self.x = np.ascontiguousarray([] if x is ... else x, dtype=np.float64)
+        self.y = np.ascontiguousarray([] if y is ... else y, dtype=np.float64)
+
+        if self.x.shape != self.y.shape:
+            raise ValueError("x and y must have the same shape")
+
+    # variable getters / setters
+    @property
+    def xy(self) -> np.ndarray:
+        """
+        (n, 2) array of coordinates
+        """
+        return np.stack((self.x, self.y), axis=-1)
+
+    @property
+    def angle(self) -> np.ndarray:
+        """
+        values in radian
+        """
+        return np.arctan2(self.y, self.x)
+
+    @angle.setter
+    def angle(self, value):
+        self.polar = value, self.length
+
+    @property
+    def length(self) -> np.ndarray:
+        return np.hypot(self.x, self.y)
+
+    @length.setter
+    def length(self, value):
+        self.polar = self.angle, value
+
+    @property
+    def polar(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.angle, self.length
+
+    @polar.setter
+    def polar(self, polar):
+        angle, length = np.broadcast_arrays(*polar)
+        self.x = np.cos(angle) * length
+        self.y = np.sin(angle) * length
+
+    # interaction
+    def split_vector(self, direction: "Vec2 | Vec2Array") -> tuple["Vec2Array", "Vec2Array"]:
+        """
+        :param direction: A vector (or one per element) facing in the wanted direction
+        :return: tuple[Vectors in only that direction, everything else]
+        """
+        angle, length = self.polar
+        direction_angle = np.broadcast_to(direction.angle, angle.shape)
+
+        a = direction_angle - angle
+        facing = Vec2Array.from_polar(angle=direction_angle, length=length * np.cos(a))
+        other = Vec2Array.from_polar(angle=direction_angle - np.pi / 2, length=length * np.sin(a))
+
+        return facing, other
+
+    def copy(self) -> "Vec2Array":
+        return Vec2Array(self.x.copy(), self.y.copy())
+
+    def normalize(self) -> "Vec2Array":
+        self.length = 1
+        return self
+
+    def mirror(self, mirror_by: "Vec2 | Vec2Array") -> "Vec2Array":
+        angle = self.angle
+        ang_d = mirror_by.angle - angle
+        self.angle = np.mod(angle - 2 * ang_d, 2 * np.pi)
+        return self
+
+    def distances_to(self, other: Vec2) -> np.ndarray:
+        """
+        distance of every vector to a single point
+        """
+        return np.hypot(self.x - other.x, self.y - other.y)
+
+    def pairwise_distances(self, other: "Vec2Array" = ...) -> np.ndarray:
+        """
+        :return: (len(self), len(other)) distance matrix
+        """
+        if other is ...:
+            other = self
+
+        return np.hypot(self.x[:, None] - other.x[None, :], self.y[:, None] - other.y[None, :])
+
+    def to_vec2s(self) -> list[Vec2]:
+        return [Vec2.from_cartesian(x, y) for x, y in zip(self.x.tolist(), self.y.tolist())]
+
+    # maths
+    @staticmethod
+    def _operands(other) -> tuple:
+        if isinstance(other, (Vec2, Vec2Array)):
+            return other.x, other.y
+
+        return other, other
+
+    def __add__(self, other) -> "Vec2Array":
+        x, y = self._operands(other)
+        return Vec2Array(self.x + x, self.y + y)
+
+    def __sub__(self, other) -> "Vec2Array":
+        x, y = self._operands(other)
+        return Vec2Array(self.x - x, self.y - y)
+
+    def __mul__(self, other) -> "Vec2Array":
+        x, y = self._operands(other)
+        return Vec2Array(self.x * x, self.y * y)
+
+    def __truediv__(self, other) -> "Vec2Array":
+        x, y = self._operands(other)
+        return Vec2Array(self.x / x, self.y / y)
+
+    def __abs__(self) -> np.ndarray:
+        return self.length
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, item) -> "Vec2 | Vec2Array":
+        if isinstance(item, (int, np.integer)):
+            return Vec2.from_cartesian(float(self.x[item]), float(self.y[item]))
+
+        return Vec2Array(self.x[item], self.y[item])
+
+    def __repr__(self):
+        return f"V[{len(self)}]({self.xy.tolist()})"
+
+    # static methods.
+    # creation of new instances
+    @staticmethod
+    def from_cartesian(x, y) -> "Vec2Array":
+        return Vec2Array(x, y)
+
+    @staticmethod
+    def from_polar(angle, length) -> "Vec2Array":
+        p = Vec2Array()
+        p.polar = angle, length
+
+        return p
+
+    @staticmethod
+    def from_xy(xy: np.ndarray) -> "Vec2Array":
+        """
+        :param xy: (n, 2) array of coordinates
+        """
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        return Vec2Array(xy[:, 0], xy[:, 1])
+
+    @staticmethod
+    def from_vec2s(vectors: list[Vec2]) -> "Vec2Array":
+        return Vec2Array(
+            np.fromiter((v.x for v in vectors), dtype=np.float64, count=len(vectors)),
+            np.fromiter((v.y for v in vectors), dtype=np.float64, count=len(vectors)),
+        )
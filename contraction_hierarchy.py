@@ -0,0 +1,410 @@
+"""
+Author:
+Nilusink
+
+contraction hierarchy: preprocess a fixed graph once, then answer
+shortest path queries by searching only "upwards" in the hierarchy
+"""
+from classes import Vec2
+from graph import Graph
+import numpy as np
+import bisect
+import heapq
+
+
+INF: float = float("inf")
+
+
+class ContractionHierarchy:
+    """
+    nodes are contracted in order of their rank (least important first).
+    contracting a node connects its remaining neighbors with shortcuts,
+    unless a path that is at least as short exists without it (witness).
+    every edge is stored once, at its lower ranked node, so a query only
+    follows edges towards higher ranks.
+    """
+    graph: Graph
+    rank: np.ndarray
+    up: Graph
+    middle: np.ndarray
+
+    def __init__(self, graph: Graph, rank: np.ndarray, up: Graph, middle: np.ndarray) -> None:
+        """
+        :param graph: the original graph
+        :param rank: (n,) contraction order of every node
+        :param up: edges (including shortcuts) towards higher ranked nodes,
+            neighbors of every node sorted by id
+        :param middle: (m,) contracted node every shortcut in `up` skips, -1 for original edges
+        """
+        self.graph = graph
+        self.rank = rank
+        self.up = up
+        self.middle = middle
+
+        self._rank = rank.tolist()
+        self._middle = middle.tolist()
+        self._arrays: tuple | None = None
+
+    @property
+    def n_shortcuts(self) -> int:
+        return int(np.count_nonzero(self.middle >= 0))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        size of the index (without the original graph)
+        """
+        return self.rank.nbytes + self.up.indptr.nbytes + self.up.indices.nbytes + self.up.weights.nbytes + self.middle.nbytes
+
+    # interaction
+    def query(self, origin: int, target: int) -> tuple[float, list[int] | None]:
+        """
+        :return: (distance, path as node ids), (inf, None) if there is no path
+        """
+        indptr, indices, weights = self.up.lists
+        distances, parents, settled = self._search_arrays()
+
+        # nodes whose entries have to be reset after the query
+        touched: tuple[list[int], list[int]] = ([origin], [target])
+        distances[0][origin] = distances[1][target] = 0.
+        heaps = ([(0., origin)], [(0., target)])
+
+        best = INF
+        meeting = -1
+        try:
+            while True:
+                # continue with the side that has the smaller key, a side is done
+                # once its smallest key can't improve the best path anymore
+                forward = heaps[0] and heaps[0][0][0] < best
+                backward = heaps[1] and heaps[1][0][0] < best
+                if not (forward or backward):
+                    break
+
+                side = 0 if forward and (not backward or heaps[0][0][0] <= heaps[1][0][0]) else 1
+                distance, node = heapq.heappop(heaps[side])
+                side_settled = settled[side]
+                if side_settled[node]:
+                    continue
+
+                side_settled[node] = True
+
+                # stall on demand: the node is reached shorter from a higher
+                # ranked neighbor, so it can't be part of a shortest up-down path
+                side_distances = distances[side]
+                start, end = indptr[node], indptr[node + 1]
+                stalled = False
+                for i in range(start, end):
+                    if side_distances[indices[i]] + weights[i] < distance:
+                        stalled = True
+                        break
+
+                if stalled:
+                    continue
+
+                other_distance = distances[1 - side][node]
+                if distance + other_distance < best:
+                    best = distance + other_distance
+                    meeting = node
+
+                side_parents = parents[side]
+                side_touched = touched[side]
+                heap = heaps[side]
+                for i in range(start, end):
+                    other = indices[i]
+                    new_distance = distance + weights[i]
+                    if new_distance < side_distances[other]:
+                        if side_distances[other] == INF:
+                            side_touched.append(other)
+
+                        side_distances[other] = new_distance
+                        side_parents[other] = node
+                        heapq.heappush(heap, (new_distance, other))
+
+            path = None if meeting < 0 else self._up_path(parents, meeting)
+
+        finally:
+            for side in (0, 1):
+                for node in touched[side]:
+                    distances[side][node] = INF
+                    parents[side][node] = -1
+                    settled[side][node] = False
+
+        if path is None:
+            return INF, None
+
+        return best, path
+
+    def _up_path(self, parents: tuple[list[int], list[int]], meeting: int) -> list[int]:
+        """
+        unpacked path over the meeting node of both searches
+        """
+        # origin -> meeting -> target, still with shortcuts
+        up_path: list[int] = []
+        node = meeting
+        while node >= 0:
+            up_path.append(node)
+            node = parents[0][node]
+
+        up_path.reverse()
+        node = parents[1][meeting]
+        while node >= 0:
+            up_path.append(node)
+            node = parents[1][node]
+
+        path = [up_path[0]]
+        for a, b in zip(up_path, up_path[1:]):
+            self._unpack(a, b, path)
+
+        return path
+
+    def path(self, origin: int, target: int) -> list[int] | None:
+        return self.query(origin, target)[1]
+
+    def distance(self, origin: int, target: int) -> float:
+        return self.query(origin, target)[0]
+
+    def route(self, origin: int, target: int) -> list[Vec2] | None:
+        """
+        unpacked shortest path as positions
+        """
+        path = self.path(origin, target)
+        return None if path is None else self.graph.to_vec2_path(path)
+
+    # internal functions
+    def _search_arrays(self) -> tuple[tuple[list[float], list[float]], tuple[list[int], list[int]], tuple[list[bool], list[bool]]]:
+        """
+        (distances, parents, settled) of the forward and backward search,
+        indexed by node id. created once and reset after every query, so a
+        query only costs what it touches
+        """
+        if self._arrays is None:
+            n = self.graph.n_nodes
+            self._arrays = (
+                ([INF] * n, [INF] * n),
+                ([-1] * n, [-1] * n),
+                ([False] * n, [False] * n),
+            )
+
+        return self._arrays
+
+    def _middle_of(self, a: int, b: int) -> int:
+        """
+        node skipped by the edge a - b, -1 for an original edge
+        """
+        if self._rank[a] > self._rank[b]:
+            a, b = b, a
+
+        indptr, indices, _ = self.up.lists
+        i = bisect.bisect_left(indices, b, indptr[a], indptr[a + 1])
+        return self._middle[i]
+
+    def _unpack(self, a: int, b: int, path: list[int]) -> None:
+        """
+        append all original nodes after `a` up to `b` to path
+        """
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middle_of(a, b)
+            if middle < 0:
+                path.append(b)
+
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    # static methods.
+    # creation of new instances
+    @staticmethod
+    def build(graph: Graph, witness_limit: int = 100, hop_limit: int = 5) -> "ContractionHierarchy":
+        """
+        contract all nodes of an (undirected) graph
+
+        :param witness_limit: maximum number of nodes settled per witness
+            search. a search that gives up early only adds a shortcut too much
+        :param hop_limit: maximum number of edges of a witness path
+        """
+        n = graph.n_nodes
+        indptr, indices, weights = graph.lists
+
+        # remaining (not yet contracted) graph
+        adjacency: list[dict[int, float]] = [
+            dict(zip(indices[indptr[i]:indptr[i + 1]], weights[indptr[i]:indptr[i + 1]])) for i in range(n)
+        ]
+        middles: list[dict[int, int]] = [{} for _ in range(n)]
+        deleted = [0] * n
+        level = [0] * n
+        rank = [-1] * n
+
+        # priorities only need to be roughly right, estimate them with cheaper searches
+        estimate_limit = max(1, witness_limit // 4)
+
+        def shortcuts(node: int, limit: int) -> list[tuple[int, int, float]]:
+            """
+            shortcuts needed to contract node
+            """
+            neighbors = list(adjacency[node].items())
+            needed: list[tuple[int, int, float]] = []
+            for i, (a, a_weight) in enumerate(neighbors[:-1]):
+                # a direct edge is the most common witness, only search for the others
+                a_adjacency = adjacency[a]
+                others = [
+                    (b, b_weight) for b, b_weight in neighbors[i + 1:]
+                    if a_adjacency.get(b, INF) > a_weight + b_weight
+                ]
+                if not others:
+                    continue
+
+                # then paths over one other node, much cheaper than a search
+                for c, c_weight in a_adjacency.items():
+                    if c == node:
+                        continue
+
+                    c_adjacency = adjacency[c]
+                    others = [
+                        (b, b_weight) for b, b_weight in others
+                        if c_weight + c_adjacency.get(b, INF) > a_weight + b_weight
+                    ]
+                    if not others:
+                        break
+
+                if not others:
+                    continue
+
+                found = _witness_search(
+                    adjacency,
+                    a,
+                    node,
+                    {b for b, _ in others},
+                    a_weight + max(b_weight for _, b_weight in others),
+                    limit,
+                    hop_limit,
+                )
+
+                for b, b_weight in others:
+                    if found.get(b, INF) > a_weight + b_weight:
+                        needed.append((a, b, a_weight + b_weight))
+
+            return needed
+
+        def priority(node: int, node_shortcuts: list) -> int:
+            # edge difference, plus spread the contraction evenly over the
+            # graph and keep the hierarchy flat (short upward searches)
+            return 2 * len(node_shortcuts) - len(adjacency[node]) + deleted[node] + level[node]
+
+        # (priority, node, deleted neighbors when the priority was estimated)
+        queue = [(priority(node, shortcuts(node, estimate_limit)), node, 0) for node in range(n)]
+        heapq.heapify(queue)
+
+        # remaining neighbors at the time of contraction all have a higher rank
+        up_edges: list[list[tuple[int, float, int]]] = [[] for _ in range(n)]
+
+        next_rank = 0
+        while queue:
+            _, node, node_deleted = heapq.heappop(queue)
+
+            # priorities are only updated lazily, and only if the neighborhood changed
+            if queue and node_deleted != deleted[node]:
+                node_priority = priority(node, shortcuts(node, estimate_limit))
+                if node_priority > queue[0][0]:
+                    heapq.heappush(queue, (node_priority, node, deleted[node]))
+                    continue
+
+            node_shortcuts = shortcuts(node, witness_limit)
+
+            rank[node] = next_rank
+            next_rank += 1
+
+            up_edges[node] = sorted(
+                (other, weight, middles[node].get(other, -1)) for other, weight in adjacency[node].items()
+            )
+            middles[node] = {}
+
+            for other in adjacency[node]:
+                del adjacency[other][node]
+                deleted[other] += 1
+                level[other] = max(level[other], level[node] + 1)
+
+            for a, b, weight in node_shortcuts:
+                if weight < adjacency[a].get(b, INF):
+                    adjacency[a][b] = adjacency[b][a] = weight
+                    middles[a][b] = middles[b][a] = node
+
+        up_indptr = np.zeros(n + 1, dtype=np.int64)
+        up_indptr[1:] = np.cumsum([len(edges) for edges in up_edges])
+        flat = [edge for edges in up_edges for edge in edges]
+
+        up = Graph(
+            graph.xy,
+            up_indptr,
+            np.array([edge[0] for edge in flat], dtype=np.int32),
+            np.array([edge[1] for edge in flat], dtype=np.float64),
+        )
+
+        return ContractionHierarchy(
+            graph,
+            np.array(rank, dtype=np.int32),
+            up,
+            np.array([edge[2] for edge in flat], dtype=np.int32),
+        )
+
+    @staticmethod
+    def from_node_connections(node_connections: dict[Vec2, list], witness_limit: int = 100) -> tuple["ContractionHierarchy", dict[Vec2, int]]:
+        """
+        :return: the hierarchy and the id of every node
+        """
+        graph, ids = Graph.from_node_connections(node_connections)
+        return ContractionHierarchy.build(graph, witness_limit), ids
+
+
+def _witness_search(
+        adjacency: list[dict[int, float]],
+        source: int,
+        skip: int,
+        targets: set[int],
+        max_distance: float,
+        limit: int,
+        hop_limit: int,
+) -> dict[int, float]:
+    """
+    limited dijkstra that avoids `skip`, settles at most `limit` nodes and
+    follows paths of at most `hop_limit` edges
+
+    :return: lengths of paths found (tentative distances are lengths of
+        existing paths as well, so they count as witnesses too)
+    """
+    distances = {source: 0.}
+    heap = [(0., source, 0)]
+    remaining = len(targets)
+    settled = 0
+    while heap:
+        distance, node, hops = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue  # outdated entry
+
+        if distance > max_distance:
+            break
+
+        if node in targets:
+            remaining -= 1
+            if not remaining:
+                break
+
+        settled += 1
+        if settled > limit:
+            break
+
+        if hops >= hop_limit:
+            continue
+
+        for other, weight in adjacency[node].items():
+            if other == skip:
+                continue
+
+            # longer paths can't be witnesses
+            new_distance = distance + weight
+            if new_distance <= max_distance and new_distance < distances.get(other, INF):
+                distances[other] = new_distance
+                heapq.heappush(heap, (new_distance, other, hops + 1))
+
+    return distances
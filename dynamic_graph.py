@@ -0,0 +1,366 @@
+"""
+Author:
+Nilusink
+
+mutable graph (nodes can be added, removed and moved) and an incremental
+finder (LPA*) that repairs its previous search after changes
+"""
+from neighbors import grid_pairs
+from typing import Callable
+from graph import Graph
+import numpy as np
+import heapq
+import math as m
+
+
+class DynamicGraph:
+    """
+    nodes are connected to all nodes within `node_range`. neighbor lists
+    are updated locally through a uniform grid (cell size = `node_range`).
+    node ids stay the same for the lifetime of a node.
+    """
+    node_range: float
+    positions: dict[int, tuple[float, float]]
+    connections: dict[int, dict[int, float]]
+    version: int
+
+    def __init__(self, node_range: float) -> None:
+        self.node_range = node_range
+        self.positions = {}
+        self.connections = {}
+        self.version = 0
+
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._next_id: int = 0
+        self._listeners: list[Callable[[set[int], set[int]], None]] = []
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, node: int) -> bool:
+        return node in self.positions
+
+    # interaction
+    def neighbors(self, node: int) -> list[int]:
+        return list(self.connections[node])
+
+    def weight(self, a: int, b: int) -> float:
+        return self.connections[a][b]
+
+    def distance(self, a: int, b: int) -> float:
+        """
+        euclidean distance between two nodes (connected or not)
+        """
+        (ax, ay), (bx, by) = self.positions[a], self.positions[b]
+        return m.hypot(ax - bx, ay - by)
+
+    def subscribe(self, callback: Callable[[set[int], set[int]], None]) -> None:
+        """
+        :param callback: called after every change with (changed nodes, removed nodes).
+            changed nodes are all nodes whose connections (or their weights) changed
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[set[int], set[int]], None]) -> None:
+        self._listeners.remove(callback)
+
+    def add_node(self, x: float, y: float) -> int:
+        """
+        :return: id of the new node
+        """
+        node = self._next_id
+        self._next_id += 1
+
+        self.positions[node] = (x, y)
+        self.connections[node] = {}
+        self._cells.setdefault(self._cell(x, y), set()).add(node)
+
+        changed = self._connect(node)
+        changed.add(node)
+        self._changed(changed, set())
+
+        return node
+
+    def remove_node(self, node: int) -> None:
+        changed = self._disconnect(node)
+
+        x, y = self.positions.pop(node)
+        del self.connections[node]
+        self._cells[self._cell(x, y)].discard(node)
+
+        self._changed(changed, {node})
+
+    def move_node(self, node: int, x: float, y: float) -> None:
+        changed = self._disconnect(node)
+
+        old_cell = self._cell(*self.positions[node])
+        self._cells[old_cell].discard(node)
+
+        self.positions[node] = (x, y)
+        self._cells.setdefault(self._cell(x, y), set()).add(node)
+
+        changed |= self._connect(node)
+        changed.add(node)
+        self._changed(changed, set())
+
+    def to_graph(self) -> tuple[Graph, list[int]]:
+        """
+        snapshot as a compact CSR graph
+
+        :return: (graph, node id of every graph index)
+        """
+        ids = sorted(self.positions)
+        index = {node: i for i, node in enumerate(ids)}
+
+        xy = np.array([self.positions[node] for node in ids], dtype=np.float64).reshape(-1, 2)
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(self.connections[node]) for node in ids])
+        indices = [index[other] for node in ids for other in sorted(self.connections[node])]
+        weights = [self.connections[node][other] for node in ids for other in sorted(self.connections[node])]
+
+        return Graph(xy, indptr, indices, weights), ids
+
+    # internal functions
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return int(x // self.node_range), int(y // self.node_range)
+
+    def _connect(self, node: int) -> set[int]:
+        """
+        connect a node to everything in range
+
+        :return: the new neighbors
+        """
+        x, y = self.positions[node]
+        cx, cy = self._cell(x, y)
+
+        new: set[int] = set()
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for other in self._cells.get((cx + dx, cy + dy), ()):
+                    if other == node:
+                        continue
+
+                    ox, oy = self.positions[other]
+                    distance = m.hypot(x - ox, y - oy)
+                    if distance <= self.node_range:
+                        self.connections[node][other] = distance
+                        self.connections[other][node] = distance
+                        new.add(other)
+
+        return new
+
+    def _disconnect(self, node: int) -> set[int]:
+        """
+        remove all connections of a node
+
+        :return: the old neighbors
+        """
+        old = set(self.connections[node])
+        for other in old:
+            del self.connections[other][node]
+
+        self.connections[node].clear()
+        return old
+
+    def _changed(self, changed: set[int], removed: set[int]) -> None:
+        self.version += 1
+        for callback in self._listeners:
+            callback(changed, removed)
+
+    # static methods.
+    # creation of new instances
+    @staticmethod
+    def from_xy(xy: np.ndarray, node_range: float) -> "DynamicGraph":
+        """
+        build from an (n, 2) array of coordinates, node ids are the row indices
+        """
+        graph = DynamicGraph(node_range)
+        sources, destinations = grid_pairs(xy, node_range)
+        distances = np.linalg.norm(xy[sources] - xy[destinations], axis=1)
+
+        for node, (x, y) in enumerate(xy.tolist()):
+            graph.positions[node] = (x, y)
+            graph.connections[node] = {}
+            graph._cells.setdefault(graph._cell(x, y), set()).add(node)
+
+        for a, b, distance in zip(sources.tolist(), destinations.tolist(), distances.tolist()):
+            graph.connections[a][b] = distance
+
+        graph._next_id = len(xy)
+        return graph
+
+
+class LPAStarFinder:
+    """
+    lifelong planning A*: keeps its search between queries and after
+    changes to the graph only repairs the part of the search that is affected
+    """
+    def __init__(self, graph: DynamicGraph, origin: int, target: int) -> None:
+        self.graph = graph
+        self.origin = origin
+        self.target = target
+
+        # number of nodes taken from the queue, over the lifetime of the finder
+        self.expanded: int = 0
+
+        self._g: dict[int, float] = {}
+        self._rhs: dict[int, float] = {}
+        self._h: dict[int, float] = {}
+        self._queued: dict[int, tuple[float, float]] = {}
+        self._queue: list[tuple[float, float, int]] = []
+
+        self._reset()
+        graph.subscribe(self._on_change)
+
+    def close(self) -> None:
+        """
+        stop following changes of the graph
+        """
+        self.graph.unsubscribe(self._on_change)
+
+    def calculate(self) -> list[int] | None:
+        """
+        shortest path from origin to target (with the current graph)
+        """
+        if self.origin not in self.graph or self.target not in self.graph:
+            return None
+
+        self._compute_shortest_path()
+
+        if self._g_of(self.target) == float("inf"):
+            return None  # target was not found
+
+        # walk back from the target along the best predecessors
+        path = [self.target]
+        node = self.target
+        while node != self.origin:
+            node = min(
+                self.graph.connections[node],
+                key=lambda other: self._g_of(other) + self.graph.connections[node][other],
+            )
+            path.append(node)
+
+        path.reverse()
+        return path
+
+    # internal functions
+    def _reset(self) -> None:
+        """
+        throw away the search and start over
+        """
+        self._g = {}
+        self._rhs = {self.origin: 0}
+        self._h = {}
+        self._queued = {}
+        self._queue = []
+
+        if self.origin in self.graph and self.target in self.graph:
+            self._push(self.origin)
+
+    def _g_of(self, node: int) -> float:
+        return self._g.get(node, float("inf"))
+
+    def _rhs_of(self, node: int) -> float:
+        return self._rhs.get(node, float("inf"))
+
+    def _h_of(self, node: int) -> float:
+        """
+        heuristic: euclidean distance to the target (cached)
+        """
+        h = self._h.get(node)
+        if h is None:
+            h = self._h[node] = self.graph.distance(node, self.target)
+
+        return h
+
+    def _key(self, node: int) -> tuple[float, float]:
+        best = min(self._g_of(node), self._rhs_of(node))
+        return best + self._h_of(node), best
+
+    def _push(self, node: int) -> None:
+        key = self._key(node)
+        self._queued[node] = key
+        heapq.heappush(self._queue, (*key, node))
+
+    def _top_key(self) -> tuple[float, float]:
+        """
+        smallest valid key in the queue (outdated entries are dropped)
+        """
+        while self._queue:
+            k1, k2, node = self._queue[0]
+            if self._queued.get(node) == (k1, k2):
+                return k1, k2
+
+            heapq.heappop(self._queue)
+
+        return float("inf"), float("inf")
+
+    def _update_vertex(self, node: int) -> None:
+        """
+        recalculate rhs from all neighbors and requeue
+        """
+        if node != self.origin:
+            connections = self.graph.connections[node]
+            self._rhs[node] = min(
+                (self._g_of(other) + weight for other, weight in connections.items()),
+                default=float("inf"),
+            )
+
+        self._requeue(node)
+
+    def _requeue(self, node: int) -> None:
+        """
+        (re)insert a node if it is inconsistent
+        """
+        # entries in the heap are invalidated by removing them from `_queued`
+        self._queued.pop(node, None)
+        if self._g_of(node) != self._rhs_of(node):
+            self._push(node)
+
+    def _compute_shortest_path(self) -> None:
+        while (
+                self._top_key() < self._key(self.target)
+                or self._rhs_of(self.target) != self._g_of(self.target)
+        ):
+            if not self._queue:
+                break
+
+            _, _, node = heapq.heappop(self._queue)
+            del self._queued[node]
+            self.expanded += 1
+
+            if self._g_of(node) > self._rhs_of(node):
+                # over-consistent: the node got cheaper, neighbors can only improve
+                g = self._g[node] = self._rhs[node]
+                for other, weight in self.graph.connections[node].items():
+                    if other != self.origin and g + weight < self._rhs_of(other):
+                        self._rhs[other] = g + weight
+                        self._requeue(other)
+
+            else:
+                # under-consistent: the node got more expensive, only neighbors
+                # whose rhs came from this node need to be recalculated
+                old_g = self._g[node]
+                self._g[node] = float("inf")
+                self._requeue(node)
+                for other, weight in self.graph.connections[node].items():
+                    if other != self.origin and self._rhs_of(other) == old_g + weight:
+                        self._update_vertex(other)
+
+    def _on_change(self, changed: set[int], removed: set[int]) -> None:
+        # the heuristic (distance to the target) changed for every node
+        if self.target in changed or self.target in removed:
+            self._reset()
+            return
+
+        for node in removed:
+            self._g.pop(node, None)
+            self._rhs.pop(node, None)
+            self._h.pop(node, None)
+            self._queued.pop(node, None)
+
+        for node in changed:
+            if node in self.graph:
+                # the node may have moved
+                self._h.pop(node, None)
+                self._update_vertex(node)
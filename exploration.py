@@ -0,0 +1,88 @@
+"""
+Author:
+Nilusink
+"""
+from search_stats import SearchStats
+from typing import Callable, Hashable
+from requesters import request_many
+
+
+class Bitmap:
+    """
+    set-like visited tracking for integer node ids in range(n)
+    """
+    def __init__(self, n: int) -> None:
+        self._bits = bytearray(n)
+
+    def __contains__(self, node: int) -> bool:
+        return bool(self._bits[node])
+
+    def add(self, node: int) -> None:
+        self._bits[node] = 1
+
+
+def explore(
+        origin: Hashable,
+        request_node_connections: Callable,
+        to_append: dict,
+        visible_nodes: list = ...,
+        n_nodes: int = ...,
+        stats: SearchStats | None = None,
+) -> None:
+    """
+    request all node connections reachable from origin (breadth first).
+    requesters with `request_many` get one request per layer.
+
+    every discovered node gets an entry {"name", "hops", "connections"}
+    in `to_append`, hops being the number of hops from origin.
+
+    :param visible_nodes: every discovered node is appended (purely for visuals)
+    :param n_nodes: if the nodes are integer ids in range(n_nodes),
+        visited nodes are tracked in a bitmap instead of a set
+    :param stats: gets the largest queue size
+    """
+    visited = set() if n_nodes is ... else Bitmap(n_nodes)
+    visible = set() if visible_nodes is ... else set(visible_nodes)
+
+    def make_visible(node) -> None:
+        if visible_nodes is not ... and node not in visible:
+            visible.add(node)
+            visible_nodes.append(node)
+
+    if origin not in to_append:
+        to_append[origin] = {
+            "name": origin,
+            "hops": 0,
+            "connections": [],
+        }
+
+    make_visible(origin)
+    visited.add(origin)
+
+    # one layer at a time (same order as a queue), so the connections of
+    # a whole frontier can be requested in one batch
+    frontier = [origin]
+    while frontier:
+        if stats is not None:
+            stats.frontier(len(frontier))
+
+        next_frontier = []
+        for node, points in zip(frontier, request_many(request_node_connections, frontier)):
+            hops = to_append[node]["hops"]
+            to_append[node]["connections"] = points
+
+            for point in points:
+                make_visible(point)
+
+                if point not in to_append:
+                    to_append[point] = {
+                        "name": point,
+                        "hops": hops + 1,
+                        "connections": [],
+                    }
+
+                if point not in visited:
+                    visited.add(point)
+                    next_frontier.append(point)
+
+        frontier = next_frontier
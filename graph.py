@@ -0,0 +1,230 @@
+"""
+Author:
+Nilusink
+"""
+from neighbors import neighbor_pairs, nodes_to_array
+from typing import Iterator, Mapping
+from renderers import ConvertingRenderer, NullRenderer, Renderer
+from classes import Vec2
+import numpy as np
+import inspect
+
+
+class IdConnections(Mapping):
+    """
+    read-only `node_connections` view of a graph, keyed by integer node ids
+    """
+    def __init__(self, graph: "Graph") -> None:
+        self._graph = graph
+
+    def __getitem__(self, key: int) -> list[int]:
+        if not 0 <= key < self._graph.n_nodes:
+            raise KeyError(key)
+
+        return self._graph.neighbors(key).tolist()
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._graph.n_nodes))
+
+    def __len__(self) -> int:
+        return self._graph.n_nodes
+
+
+class Graph:
+    """
+    compact graph: node coordinates and CSR adjacency with precomputed
+    (euclidean) edge weights. nodes are referred to by integer ids.
+    """
+    xy: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    version: int
+
+    def __init__(
+            self,
+            xy: np.ndarray,
+            indptr: np.ndarray,
+            indices: np.ndarray,
+            weights: np.ndarray = ...,
+    ) -> None:
+        """
+        :param xy: (n, 2) node coordinates
+        :param indptr: (n + 1,) start of every node's neighbours in `indices`
+        :param indices: (m,) neighbour ids
+        :param weights: (m,) edge weights, calculated from `xy` if not given
+        """
+        self.xy = np.asarray(xy, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+
+        if weights is ...:
+            sources = np.repeat(np.arange(self.n_nodes), np.diff(self.indptr))
+            weights = np.linalg.norm(self.xy[self.indices] - self.xy[sources], axis=1)
+
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+        # increased on every change, so caches can tell they are outdated
+        self.version = 0
+        self._lists: tuple[list[int], list[int], list[float]] | None = None
+
+    # properties
+    @property
+    def n_nodes(self) -> int:
+        return len(self.xy)
+
+    @property
+    def n_edges(self) -> int:
+        """
+        number of directed edges
+        """
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        return self.xy.nbytes + self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    @property
+    def lists(self) -> tuple[list[int], list[int], list[float]]:
+        """
+        (indptr, indices, weights) as python lists, much faster than
+        indexing the arrays one element at a time from python code.
+        reads all of a memory-mapped graph into memory
+        """
+        if self._lists is None:
+            self._lists = self.indptr.tolist(), self.indices.tolist(), self.weights.tolist()
+
+        return self._lists
+
+    def mark_changed(self) -> None:
+        """
+        call after modifying the arrays
+        """
+        self.version += 1
+        self._lists = None
+
+    # interaction
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def neighbor_weights(self, node: int) -> np.ndarray:
+        return self.weights[self.indptr[node]:self.indptr[node + 1]]
+
+    def distance(self, a: int, b: int) -> float:
+        """
+        euclidean distance between two nodes
+        """
+        dx, dy = self.xy[a] - self.xy[b]
+        return float(np.hypot(dx, dy))
+
+    def node(self, node: int) -> Vec2:
+        return Vec2.from_cartesian(*self.xy[node].tolist())
+
+    def to_vec2_path(self, path: list[int]) -> list[Vec2]:
+        return [self.node(node) for node in path]
+
+    def adjacency(self) -> IdConnections:
+        return IdConnections(self)
+
+    def undirected_edges(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        every connection once, as (a, b) with a < b. connections have to go
+        both ways, like the ones built by `neighbor_pairs`
+
+        :return: ((E, 2) node ids, (E,) weights)
+        """
+        sources = np.repeat(np.arange(self.n_nodes, dtype=np.int32), np.diff(self.indptr))
+        mask = sources < self.indices
+
+        return np.stack((sources[mask], self.indices[mask]), axis=1), self.weights[mask]
+
+    def to_node_connections(self) -> dict[Vec2, list[Vec2]]:
+        """
+        `node_connections` as used by the finders. every id gets its own
+        `Vec2` (hashed by identity), so nodes at the same position stay
+        separate nodes with their own connections, and
+        `from_node_connections` gives back the same ids and edges.
+        reads all of a memory-mapped graph into memory
+        """
+        nodes = [self.node(node) for node in range(self.n_nodes)]
+        indptr, indices, _ = self.lists
+
+        return {
+            nodes[node]: [nodes[other] for other in indices[indptr[node]:indptr[node + 1]]]
+            for node in range(self.n_nodes)
+        }
+
+    # static methods.
+    # creation of new instances
+    @staticmethod
+    def from_pairs(xy: np.ndarray, sources: np.ndarray, destinations: np.ndarray) -> "Graph":
+        """
+        :param sources: directed edge sources, sorted
+        :param destinations: directed edge destinations
+        """
+        indptr = np.searchsorted(sources, np.arange(len(xy) + 1))
+        return Graph(xy, indptr, destinations)
+
+    @staticmethod
+    def from_nodes(nodes: list[Vec2], node_range: float, method: str = "grid") -> "Graph":
+        """
+        connect every node to all nodes in range (output of `generate_nodes`)
+        """
+        xy = nodes_to_array(nodes)
+        return Graph.from_pairs(xy, *neighbor_pairs(xy, node_range, method))
+
+    @staticmethod
+    def from_node_connections(node_connections: dict[Vec2, list]) -> tuple["Graph", dict[Vec2, int]]:
+        """
+        :return: the graph and the id of every node
+        """
+        ids = {node: i for i, node in enumerate(node_connections)}
+        xy = nodes_to_array(list(node_connections))
+
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(connections) for connections in node_connections.values()])
+        indices = np.fromiter(
+            (ids[other] for connections in node_connections.values() for other in connections),
+            dtype=np.int32,
+            count=int(indptr[-1]),
+        )
+
+        return Graph(xy, indptr, indices), ids
+
+
+def graph_finder(
+        finder_type: type,
+        graph: Graph,
+        visible_nodes: list[int] = ...,
+        sleep_time: float = 0,
+        renderer: Renderer = ...,
+):
+    """
+    create a finder (`PathCalculator`, `AllKnowing`, `AllKnowing2`) that
+    runs on the integer node ids of a graph.
+
+    :param renderer: receives paths as lists of `Vec2` (converted with
+        `Graph.to_vec2_path`), draws nothing by default
+    """
+    if visible_nodes is ...:
+        visible_nodes = []
+
+    if renderer is ...:
+        renderer = NullRenderer()
+
+    else:
+        renderer = ConvertingRenderer(renderer, graph.to_vec2_path)
+
+    adjacency = graph.adjacency()
+    args = [adjacency, visible_nodes, sleep_time, renderer.redraw, renderer.draw_path]
+
+    # the AllKnowing variants additionally need a requester
+    parameters = inspect.signature(finder_type).parameters
+    if "request_node_connections" in parameters:
+        args.append(adjacency.__getitem__)
+
+    kwargs = {}
+    if "graph" in parameters:
+        kwargs["graph"] = graph
+
+    return finder_type(*args, distance_func=graph.distance, renderer=renderer, **kwargs)
@@ -0,0 +1,150 @@
+"""
+Author:
+Nilusink
+
+binary graph files: a small header followed by the raw arrays of a
+`Graph`. the arrays are memory-mapped when loading, so opening a file is
+instant and only the parts a query touches are read from disk.
+
+that only holds for code that indexes the arrays directly
+(`Graph.neighbors`, `Graph.adjacency`, `graph_finder`, `bfs_layers`).
+`Graph.lists` (used by `graph_search.dijkstra`, the query cache and the
+contraction hierarchy) and `Graph.to_node_connections` (used by main and
+the benchmark for the Vec2 finders) read the whole graph into memory.
+
+usage (generate a random graph and save it):
+    python graph_file.py graph.bin --nodes 100000 --range 20 --seed 0
+
+layout (little endian):
+    header      64 bytes, see `HEADER`
+    xy          float64 (n_nodes, 2)
+    indptr      int64   (n_nodes + 1,)
+    indices     int32   (n_edges,)
+    weights     float64 (n_edges,)
+every array starts at a multiple of 8 bytes
+"""
+from neighbors import grid_pairs
+from graph import Graph
+import numpy as np
+import argparse
+import struct
+import time
+import math as m
+
+
+MAGIC: bytes = b"PFGRAPH\0"
+VERSION: int = 1
+
+# magic, version, n_nodes, n_edges, node_range (nan if unknown), padded to 64 bytes
+HEADER: struct.Struct = struct.Struct("<8sIQQd28x")
+
+
+class GraphFileError(ValueError):
+    """
+    the file isn't a graph file or has an unsupported version
+    """
+
+
+def _layout(n_nodes: int, n_edges: int) -> list[tuple[str, np.dtype, tuple[int, ...], int]]:
+    """
+    :return: (name, dtype, shape, offset) of every array
+    """
+    arrays = [
+        ("xy", np.dtype("<f8"), (n_nodes, 2)),
+        ("indptr", np.dtype("<i8"), (n_nodes + 1,)),
+        ("indices", np.dtype("<i4"), (n_edges,)),
+        ("weights", np.dtype("<f8"), (n_edges,)),
+    ]
+
+    layout = []
+    offset = HEADER.size
+    for name, dtype, shape in arrays:
+        layout.append((name, dtype, shape, offset))
+        offset += dtype.itemsize * m.prod(shape)
+        offset += -offset % 8
+
+    return layout
+
+
+def save_graph(graph: Graph, path: str, node_range: float = ...) -> None:
+    """
+    :param node_range: stored with the graph, if known
+    """
+    if node_range is ...:
+        node_range = float("nan")
+
+    with open(path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, VERSION, graph.n_nodes, graph.n_edges, node_range))
+
+        for name, dtype, shape, offset in _layout(graph.n_nodes, graph.n_edges):
+            out.write(b"\0" * (offset - out.tell()))
+            out.write(np.ascontiguousarray(getattr(graph, name), dtype=dtype).tobytes())
+
+
+def read_header(path: str) -> dict:
+    """
+    :return: version, n_nodes, n_edges and node_range (None if unknown)
+    """
+    with open(path, "rb") as file:
+        data = file.read(HEADER.size)
+
+    if len(data) < HEADER.size:
+        raise GraphFileError(f"{path}: file too short")
+
+    magic, version, n_nodes, n_edges, node_range = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise GraphFileError(f"{path}: not a graph file")
+
+    if version != VERSION:
+        raise GraphFileError(f"{path}: unsupported version {version} (expected {VERSION})")
+
+    return {
+        "version": version,
+        "n_nodes": n_nodes,
+        "n_edges": n_edges,
+        "node_range": None if m.isnan(node_range) else node_range,
+    }
+
+
+def load_graph(path: str, mmap: bool = True) -> Graph:
+    """
+    :param mmap: map the arrays read-only instead of reading them into memory
+    """
+    header = read_header(path)
+
+    arrays = {}
+    for name, dtype, shape, offset in _layout(header["n_nodes"], header["n_edges"]):
+        if mmap:
+            # numpy can't map empty arrays
+            arrays[name] = np.memmap(path, dtype, "r", offset, shape) if m.prod(shape) else np.zeros(shape, dtype)
+
+        else:
+            arrays[name] = np.fromfile(path, dtype, m.prod(shape), offset=offset).reshape(shape)
+
+    return Graph(arrays["xy"], arrays["indptr"], arrays["indices"], arrays["weights"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generate a random graph and save it")
+    parser.add_argument("path")
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--range", type=float, default=150)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # same distribution as `benchmark.generate_nodes`
+    rng = np.random.default_rng(args.seed)
+    xs = rng.integers(0, args.width, args.nodes)
+    ys = rng.integers(0, args.height, args.nodes)
+    xy = np.stack((xs, ys), axis=1).astype(np.float64)
+
+    start = time.perf_counter()
+    graph = Graph.from_pairs(xy, *grid_pairs(xy, args.range))
+    save_graph(graph, args.path, args.range)
+    print(f"{args.path}: {graph.n_nodes} nodes, {graph.n_edges} directed edges ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
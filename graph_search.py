@@ -0,0 +1,182 @@
+"""
+Author:
+Nilusink
+
+searches on the integer node ids of a `Graph`
+"""
+from graph import Graph
+import numpy as np
+import heapq
+
+
+def dijkstra(
+        graph: Graph,
+        source: int,
+        targets: set[int] = ...,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    shortest path tree from source
+
+    :param targets: stop as soon as all of these are settled (default: full tree)
+    :return: (distances, parents, settled). distances and parents are only
+        valid for settled nodes, parents of the source and unsettled nodes are -1
+    """
+    indptr, indices, weights = graph.lists
+    n = graph.n_nodes
+
+    distances = [float("inf")] * n
+    parents = [-1] * n
+    settled = bytearray(n)
+    remaining = set() if targets is ... else set(targets)
+
+    distances[source] = 0
+    heap: list[tuple[float, int]] = [(0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+
+        settled[node] = 1
+        if targets is not ...:
+            remaining.discard(node)
+            if not remaining:
+                break
+
+        for i in range(indptr[node], indptr[node + 1]):
+            other = indices[i]
+            new_distance = distance + weights[i]
+            if new_distance < distances[other]:
+                distances[other] = new_distance
+                parents[other] = node
+                heapq.heappush(heap, (new_distance, other))
+
+    settled = np.frombuffer(settled, dtype=np.bool_)
+    distances = np.array(distances, dtype=np.float64)
+    distances[~settled] = np.inf
+
+    return distances, np.array(parents, dtype=np.int32), settled
+
+
+def unwind(parents: np.ndarray, node: int) -> list[int]:
+    """
+    follow the parents up to the root of the tree
+
+    :return: [node, parent, ..., root]
+    """
+    path: list[int] = []
+    while node >= 0:
+        path.append(node)
+        node = int(parents[node])
+
+    return path
+
+
+def _by_source(origins: list[int], targets: list[int]) -> dict[int, set[int]]:
+    """
+    targets of every distinct origin
+    """
+    grouped: dict[int, set[int]] = {}
+    for origin, target in zip(origins, targets):
+        grouped.setdefault(origin, set()).add(target)
+
+    return grouped
+
+
+def many_to_many(graph: Graph, pairs: list[tuple[int, int]]) -> tuple[np.ndarray, list[np.ndarray | None]]:
+    """
+    shortest paths for many (origin, target) pairs, one search per distinct
+    origin that stops once all of its targets are settled
+
+    :return: (distances, paths) in the order of pairs. distance is inf and
+        path None if the target can't be reached
+    """
+    origins = [origin for origin, _ in pairs]
+    targets = [target for _, target in pairs]
+
+    trees = {
+        origin: dijkstra(graph, origin, origin_targets)
+        for origin, origin_targets in _by_source(origins, targets).items()
+    }
+
+    distances = np.full(len(pairs), np.inf)
+    paths: list[np.ndarray | None] = []
+    for i, (origin, target) in enumerate(pairs):
+        tree_distances, parents, settled = trees[origin]
+        if not settled[target]:
+            paths.append(None)
+            continue
+
+        distances[i] = tree_distances[target]
+        paths.append(np.array(unwind(parents, target)[::-1], dtype=np.int32))
+
+    return distances, paths
+
+
+def distance_matrix(graph: Graph, origins: list[int], targets: list[int]) -> np.ndarray:
+    """
+    :return: (len(origins), len(targets)) shortest distances, inf if unreachable
+    """
+    targets = np.asarray(targets, dtype=np.int64)
+    matrix = np.full((len(origins), len(targets)), np.inf)
+
+    # origins that show up more than once share their row
+    rows: dict[int, np.ndarray] = {}
+    for i, origin in enumerate(origins):
+        if origin not in rows:
+            distances, _, _ = dijkstra(graph, origin, set(targets.tolist()))
+            rows[origin] = distances[targets]
+
+        matrix[i] = rows[origin]
+
+    return matrix
+
+
+def bfs_layers(
+        graph: Graph,
+        source: int,
+        stop: int = -1,
+        max_layers: int = ...,
+) -> tuple[np.ndarray, list[np.ndarray]]:
+    """
+    hop distances from source, one layer at a time on the CSR arrays
+    (gather the neighbors of the whole frontier, drop visited ones, keep
+    the first occurrence of each). the nodes of a layer are in the order
+    a node by node BFS would discover them.
+
+    :param stop: the layer containing stop is the last one
+    :param max_layers: no more than max_layers layers (including the source)
+    :return: (hops, layers). hops is -1 for nodes that weren't reached
+    """
+    indptr, indices = graph.indptr, graph.indices
+    degrees = np.diff(indptr)
+
+    hops = np.full(graph.n_nodes, -1, dtype=np.int32)
+    first = np.zeros(graph.n_nodes, dtype=np.int64)
+    hops[source] = 0
+
+    frontier = np.array([source], dtype=np.int32)
+    layers = [frontier]
+    while max_layers is ... or len(layers) < max_layers:
+        if stop >= 0 and hops[stop] >= 0:
+            break
+
+        # positions of all neighbors of the frontier in `indices`
+        counts = degrees[frontier]
+        ends = np.cumsum(counts)
+        offsets = np.repeat(indptr[frontier] - (ends - counts), counts)
+        neighbors = indices[offsets + np.arange(len(offsets))]
+
+        neighbors = neighbors[hops[neighbors] < 0]
+        if not len(neighbors):
+            break
+
+        # keep the first occurrence of every node
+        positions = np.arange(len(neighbors))
+        first[neighbors] = len(neighbors)
+        np.minimum.at(first, neighbors, positions)
+        frontier = neighbors[first[neighbors] == positions]
+
+        hops[frontier] = len(layers)
+        layers.append(frontier)
+
+    return hops, layers
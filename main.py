@@ -1,13 +1,20 @@
 from typing import Callable
-from random import sample
 import pygame as pg
 import numpy as np
 import time
-import csv
+import sys
 
 
 from classes import Vec2
-from path_finders import AllKnowing, AllKnowing2
+from search_stats import SearchStats, phase
+from neighbors import build_node_connections
+from graph_file import load_graph, read_header
+from graph import Graph
+from path_smoothing import shorten_path
+from renderers import NullRenderer, PygameRenderer, Renderer, ThrottledRenderer
+from render_cache import RenderCache, draw_edges, edge_colors
+from results import open_sink
+from path_finders import AllKnowing, AllKnowing2, DijkstraFinder, AStarFinder, path_length
 
 # settings
 WIDTH: int = 1920
@@ -16,8 +23,22 @@ NODE_RANGE: float = 150
 NUMBER_NODES: int = 500
 DRAW_ALL_CONNECTIONS: bool = False
 WRITE_DATA: bool = True
+RESULTS_FILE: str = "results.csv"  # .bin for binary records (see results.py)
+FLUSH_INTERVAL: float = 1  # seconds
 SLEEP_TIME: float = .0
 LOOP: bool = True
+DRAW_SEARCH: bool = True    # draw every step of the search
+MAX_FPS: float = 0          # limit the search drawing (0 = no limit)
+GRAPH_FILE: str | None = None   # use the graph in this file (see graph_file.py) instead of random nodes
+COLLECT_STATS: bool = False     # count expanded nodes (slows down the timed searches)
+
+# finders to compare and the color their path is drawn in
+FINDERS: list[tuple[type, tuple[int, int, int]]] = [
+    (AllKnowing, (255, 0, 0)),
+    (AllKnowing2, (0, 255, 0)),
+    (DijkstraFinder, (0, 128, 255)),
+    (AStarFinder, (255, 128, 0)),
+]
 
 
 def generate_nodes(n) -> list[Vec2]:
@@ -35,75 +56,88 @@ def generate_nodes(n) -> list[Vec2]:
 
 
 def main():
-    shortest_n = [0, 0, 0]
-    times = [0, 0, 0]
+    shortest_n = [0] * len(FINDERS)
+    times = [0] * len(FINDERS)
+
+    # a fixed graph from a file, otherwise new random nodes every time
+    graph_connections: dict[Vec2, list] | None = None
+    node_range = NODE_RANGE
+    if GRAPH_FILE is not None:
+        # the Vec2 finders need the whole graph in memory, the file is only read once
+        graph_connections = load_graph(GRAPH_FILE).to_node_connections()
+        node_range = read_header(GRAPH_FILE)["node_range"] or NODE_RANGE
+
+    # written at least once a second, so test_results.py can follow along
+    sink = open_sink(RESULTS_FILE if WRITE_DATA else None, flush_interval=FLUSH_INTERVAL)
 
     pg.init()
 
     screen = pg.display.set_mode((0, 0), pg.FULLSCREEN)
     clock = pg.time.Clock()
 
+    # connections of the graph from GRAPH_FILE, drawn by the first trial
+    edge_layer: pg.Surface | None = None
+
     def recalculate():
         """
         generate new nodes and redraw on screen
         """
-        nodes = generate_nodes(NUMBER_NODES)
-
-        # choose two nodes that need to be connected
-        to_connect: list[Vec2] = sample(nodes, 2)
-        visible_nodes: list[Vec2] = [to_connect[0]]
+        # every trial can be reproduced from its seed
+        seed = int(np.random.randint(2 ** 31))
+        np.random.seed(seed)
 
-        # calculate paths
-        paths: list[set[Vec2, Vec2]] = []
-        node_connections: dict[Vec2, list] = {}
-        for node in nodes:
-            in_range: list[Vec2] = []
+        if graph_connections is None:
+            nodes = generate_nodes(NUMBER_NODES)
+            node_connections: dict[Vec2, list] = build_node_connections(nodes, node_range)
 
-            # get all nodes in range
-            for other_node in nodes:
-                if not other_node == node:
-                    # check if node is in range
-                    if (node - other_node).length <= NODE_RANGE:
-                        in_range.append(other_node)
+        else:
+            nodes = list(graph_connections)
+            node_connections = graph_connections
 
-            node_connections[node] = in_range
+        # choose two nodes that need to be connected
+        to_connect: list[Vec2] = [nodes[i] for i in np.random.choice(len(nodes), 2, replace=False)]
+        visible_nodes: list[Vec2] = [to_connect[0]]
 
-            # append to paths
-            for other_node in in_range:
-                pair: set[Vec2, Vec2] = {node, other_node}
+        def draw_connections(surface: pg.Surface):
+            nonlocal edge_layer
+            if not DRAW_ALL_CONNECTIONS:
+                return
 
-                if pair not in paths:
-                    paths.append(pair)
+            # a fixed graph is only drawn once, then copied
+            if edge_layer is not None:
+                surface.blit(edge_layer, (0, 0))
+                return
 
-        def redraw():
-            screen.fill((0, 0, 0))
+            # every connection once and its color
+            graph, _ = Graph.from_node_connections(node_connections)
+            edges, lengths = graph.undirected_edges()
+            buckets, palette = edge_colors(lengths, node_range)
+            draw_edges(surface, graph.xy, edges, buckets, palette)
 
-            # draw connections
-            if DRAW_ALL_CONNECTIONS:
-                for connection in paths:
-                    connection = list(connection)
+            if graph_connections is not None:
+                edge_layer = surface.copy()
 
-                    # how good the connection is based on distance
-                    quality: float = 1 - ((connection[0] - connection[1]).length / NODE_RANGE)
+        def draw_node(surface: pg.Surface, node: Vec2) -> pg.Rect:
+            # if the node is a target node, it should have another color
+            if node in to_connect:
+                if node == to_connect[0]:
+                    col = (255, 0, 255)
 
-                    col = (255 * (1 - quality), 255 * quality, 0)
-                    pg.draw.line(screen, col, connection[0].xy, connection[1].xy)
+                else:
+                    col = (255, 255, 0)
 
-            # draw nodes
-            for node in visible_nodes:
-                # if the node is a target node, it should have another color
-                if node in to_connect:
-                    if node == to_connect[0]:
-                        col = (255, 0, 255)
+            else:
+                col = (255, 255, 255)
 
-                    else:
-                        col = (255, 255, 0)
+            radius = 10 if node in to_connect else 5
+            return pg.draw.circle(surface, col, (node.x, node.y), radius)
 
-                else:
-                    col = (255, 255, 255)
+        # connections and nodes are only drawn once, every frame just
+        # replaces the path drawn on top of them
+        cache = RenderCache(screen, draw_connections, draw_node, visible_nodes)
 
-                radius = 10 if node in to_connect else 5
-                pg.draw.circle(screen, col, (node.x, node.y), radius)
+        def redraw():
+            cache.redraw()
 
         def draw_path(path, color: tuple[int, int, int] = ...):
             if color is ...:
@@ -111,51 +145,17 @@ def main():
 
             for i in range(len(path)):
                 if i != len(path) - 1:
-                    pg.draw.line(screen, color, path[i].xy, path[i + 1].xy, width=2)
+                    cache.draw(pg.draw.line, color, path[i].xy, path[i + 1].xy, width=2)
 
                 node = path[i]
-                pg.draw.circle(screen, (0, 50, 0), (node.x, node.y), NODE_RANGE, width=1)
-
-        def shorten_path(path: list[Vec2]) -> list[Vec2]:
-            """
-            shorten a given path
-            """
-            if len(path) < 3:
-                return path
-
-            node = path[0]
-
-            # filter all nodes below
-            better_connections = list(reversed(path[2:]))
+                cache.draw(pg.draw.circle, (0, 50, 0), (node.x, node.y), node_range, width=1)
 
-            # remove all out-of-range nodes
-            better_connections = list(filter(lambda n: (node - n).length <= NODE_RANGE, better_connections))
+        renderer: Renderer = PygameRenderer(redraw, draw_path, cache.flip)
+        if not DRAW_SEARCH:
+            renderer = NullRenderer()
 
-            if better_connections:
-                # choose the highest value node
-                r_node = better_connections[0]
-
-                # remove all not-needed nodes
-                try:
-                    new_path = [node] + path.copy()[path.index(r_node):]
-
-                except ValueError:
-                    print(r_node.xy, [p.xy for p in path])
-                    raise
-
-                redraw()
-                draw_path(new_path)
-                pg.display.flip()
-
-                path = new_path
-
-            try:
-                time.sleep(SLEEP_TIME / 10)
-                return [node] + shorten_path(path[1:])
-
-            except RecursionError:
-                print("recursion error")
-                return path
+        elif MAX_FPS > 0:
+            renderer = ThrottledRenderer(renderer, MAX_FPS)
 
         # calculator = PathCalculator(
         #     node_connections,
@@ -165,25 +165,21 @@ def main():
         #     draw_path,
         # )
 
-        finder = AllKnowing(
-            node_connections,
-            visible_nodes,
-            SLEEP_TIME,
-            redraw,
-            draw_path,
-            lambda key: node_connections[key],
-        )
-
-        finder2 = AllKnowing2(
-            node_connections,
-            visible_nodes,
-            SLEEP_TIME,
-            redraw,
-            draw_path,
-            lambda key: node_connections[key],
-        )
-
-        def calc(func: Callable, color):
+        all_stats = [SearchStats() if COLLECT_STATS else None for _ in FINDERS]
+        finders = [
+            finder_type(
+                node_connections,
+                visible_nodes,
+                SLEEP_TIME,
+                redraw,
+                draw_path,
+                lambda key: node_connections[key],
+                renderer=renderer,
+                stats=stats,
+            ) for (finder_type, _), stats in zip(FINDERS, all_stats)
+        ]
+
+        def calc(func: Callable, color, stats: SearchStats | None):
             redraw()
             connection = func(*to_connect)
 
@@ -193,23 +189,14 @@ def main():
             redraw()
             if connection:
                 # try to shorten path
-                connection = shorten_path(connection)
+                with phase(stats, "shortening"):
+                    connection = shorten_path(connection, node_range, renderer, sleep_time=SLEEP_TIME / 10)
+
                 draw_path(connection, color)
 
-            pg.display.flip()
+            cache.flip()
             return connection
 
-        def path_length(path) -> float:
-            """
-            calculates the length of a path
-            """
-
-            s = 0
-            for j in range(len(path) - 1):
-                s += (path[j] - path[j - 1]).length
-
-            return s
-
         def winner(paths) -> tuple[list[int], float]:
             """
             determines which of the paths is the best
@@ -230,57 +217,48 @@ def main():
 
         def test():
             redraw()
-            ts = time.perf_counter()
-            p1 = calc(finder.calculate, (255, 0, 0))
-            t1 = time.perf_counter()
-            p2 = calc(finder2.calculate, (0, 255, 0))
-            t2 = time.perf_counter()
+            all_paths: list[list[Vec2] | None] = []
+            durations: list[float] = []
+            for finder, (_, color), stats in zip(finders, FINDERS, all_stats):
+                ts = time.perf_counter()
+                all_paths.append(calc(finder.calculate, color, stats))
+                durations.append(time.perf_counter() - ts)
 
-            if p1:
-                draw_path(p1, (255, 0, 0))
-
-            if p2:
-                draw_path(p2, (0, 255, 0))
+            for path, (_, color) in zip(all_paths, FINDERS):
+                if path:
+                    draw_path(path, color)
 
             # append times
-            d1 = d2 = None
-            if p1 is not None:
-                d1 = t1 - ts
-                times[0] += d1
-
-            if p2 is not None:
-                d2 = t2 - t1
-                times[1] += d2
-
-            if not p1 or not p2:
-                return
+            for i, path in enumerate(all_paths):
+                if path is not None:
+                    times[i] += durations[i]
 
             # winner declaration
-            all_paths = [p1, p2]
-            winner_ids, shortest_l = winner(all_paths)
+            winner_ids: list[int] = []
+            if all(all_paths):
+                winner_ids, shortest_l = winner(all_paths)
 
-            shortest = all_paths[winner_ids[0]]
+                shortest = all_paths[winner_ids[0]]
 
-            draw_path(shortest, (255, 255, 255))
+                draw_path(shortest, (255, 255, 255))
 
-            if WRITE_DATA:
-                if all([d1 is not None, d2 is not None]):
-                    with open("results.csv", "a") as out:
-                        writer = csv.writer(out)
-                        writer.writerow([
-                            d1, int(all_paths.index(p1) in winner_ids),
-                            d2, int(all_paths.index(p2) in winner_ids),
-                        ])
+                shortest_n[winner_ids[0]] += 1
 
-            if shortest == p1:
-                shortest_n[0] += 1
-
-            elif shortest == p2:
-                shortest_n[1] += 1
+            sink.write_many({
+                "seed": seed,
+                "n": len(nodes),
+                "node_range": node_range,
+                "finder": finder_type.__name__,
+                "found": path is not None,
+                "time": durations[i],
+                "length": path_length(path) if path else None,
+                "expanded": all_stats[i].expanded if COLLECT_STATS else -1,
+                "win": i in winner_ids,
+            } for i, (path, (finder_type, _)) in enumerate(zip(all_paths, FINDERS)))
 
         test()
 
-        pg.display.flip()
+        cache.flip()
 
         events = pg.event.get()
         for event in events:
@@ -319,9 +297,13 @@ def main():
             clock.tick(30)
 
     finally:
+        sink.close()
         print(shortest_n)
         print(times)
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        GRAPH_FILE = sys.argv[1]
+
     main()
@@ -0,0 +1,109 @@
+"""
+Author:
+Nilusink
+
+local stand-in for a remote node network: a tcp server that answers
+connection requests after a simulated latency, and an async client to
+use as the requester of the async finders.
+
+protocol: one line per request / response, nodes are sent as their
+index in the (shared) node list
+    request:    "<node>\n"
+    response:   "<neighbor> <neighbor> ...\n"
+"""
+from typing import Hashable
+import asyncio
+
+
+class NeighborServer:
+    """
+    answers every request after `latency` seconds. requests are handled
+    concurrently, one at a time per connection
+    """
+    def __init__(self, node_connections: dict, latency: float = .005) -> None:
+        self.latency = latency
+        self.requests = 0
+
+        nodes = list(node_connections)
+        index = {node: i for i, node in enumerate(nodes)}
+        self.nodes = nodes
+        self._responses = [
+            (" ".join(str(index[point]) for point in node_connections[node]) + "\n").encode()
+            for node in nodes
+        ]
+
+        self._server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        :param port: 0 picks a free port (see `port`)
+        """
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "NeighborServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+
+                writer.write(self._responses[int(line)])
+                await writer.drain()
+
+        finally:
+            writer.close()
+
+
+class NeighborClient:
+    """
+    async connection requester talking to a `NeighborServer`. a new tcp
+    connection is opened whenever all open ones are busy, so the number
+    of connections follows the number of concurrent requests
+    """
+    def __init__(self, nodes: list, host: str = "127.0.0.1", port: int = ...) -> None:
+        """
+        :param nodes: the node list of the server, to translate indices
+        """
+        self.host = host
+        self.port = port
+        self.nodes = nodes
+        self._index = {node: i for i, node in enumerate(nodes)}
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._open: list[asyncio.StreamWriter] = []
+
+    async def __call__(self, node: Hashable) -> list:
+        if self._idle:
+            reader, writer = self._idle.pop()
+
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            self._open.append(writer)
+
+        writer.write(f"{self._index[node]}\n".encode())
+        await writer.drain()
+        line = await reader.readline()
+
+        self._idle.append((reader, writer))
+        return [self.nodes[int(i)] for i in line.split()]
+
+    async def close(self) -> None:
+        for writer in self._open:
+            writer.close()
+            await writer.wait_closed()
+
+        self._open.clear()
+        self._idle.clear()
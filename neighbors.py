@@ -0,0 +1,160 @@
+"""
+Author:
+Nilusink
+"""
+from classes import Vec2
+import numpy as np
+
+
+def nodes_to_array(nodes: list[Vec2]) -> np.ndarray:
+    """
+    convert a list of nodes to an (n, 2) float array
+    """
+    xy = np.empty((len(nodes), 2), dtype=np.float64)
+    for i, node in enumerate(nodes):
+        xy[i] = node.x, node.y
+
+    return xy
+
+
+def _sort_pairs(src: np.ndarray, dst: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    sort pairs by source, then destination (same ordering as the brute force loop)
+    """
+    keys = np.sort(src * n + dst)
+    return keys // n, keys % n
+
+
+def grid_pairs(xy: np.ndarray, node_range: float, chunk_size: int = 2_000_000) -> tuple[np.ndarray, np.ndarray]:
+    """
+    find all (directed) pairs of points that are within `node_range`
+    of each other using a uniform grid with cell size = `node_range`
+
+    :param xy: (n, 2) array of coordinates
+    :param node_range: maximum distance between two connected nodes
+    :param chunk_size: maximum number of candidate pairs checked at once
+    :return: (source ids, destination ids), sorted by source, then destination
+    """
+    n = len(xy)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # assign every point to a cell
+    cells = np.floor((xy - xy.min(axis=0)) / node_range).astype(np.int64)
+    n_rows = int(cells[:, 1].max()) + 3     # padding, so neighbour offsets never wrap
+    cell_ids = (cells[:, 0] + 1) * n_rows + (cells[:, 1] + 1)
+
+    # sort points by cell, so every cell is a contiguous block
+    # (all work is done in sorted order, which keeps memory access local)
+    order = np.argsort(cell_ids, kind="stable")
+    sorted_xy = xy[order]
+    unique_cells, cell_starts, cell_counts = np.unique(cell_ids[order], return_index=True, return_counts=True)
+    point_cells = np.repeat(np.arange(len(unique_cells)), cell_counts)
+
+    sources: list[np.ndarray] = []
+    destinations: list[np.ndarray] = []
+    r2 = node_range ** 2
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            # for every cell, find the neighbouring cell in this direction
+            other = unique_cells + dx * n_rows + dy
+            pos = np.searchsorted(unique_cells, other)
+            pos[pos >= len(unique_cells)] = 0
+            found = unique_cells[pos] == other
+
+            # every point gets the block of points in its neighbouring cell
+            points = np.nonzero(found[point_cells])[0]
+            starts = cell_starts[pos[point_cells[points]]]
+            counts = cell_counts[pos[point_cells[points]]]
+
+            # process in chunks to keep the candidate arrays small
+            totals = np.cumsum(counts)
+            chunk_start = 0
+            while chunk_start < len(points):
+                offset = totals[chunk_start - 1] if chunk_start > 0 else 0
+                chunk_end = int(np.searchsorted(totals, offset + chunk_size, side="right"))
+                chunk_end = max(chunk_end, chunk_start + 1)
+
+                c_points = points[chunk_start:chunk_end]
+                c_starts = starts[chunk_start:chunk_end]
+                c_counts = counts[chunk_start:chunk_end]
+
+                # expand every point into (point, candidate) pairs
+                src = np.repeat(c_points, c_counts)
+                block_offsets = np.arange(len(src)) - np.repeat(np.cumsum(c_counts) - c_counts, c_counts)
+                dst = np.repeat(c_starts, c_counts) + block_offsets
+
+                # vectorized distance check
+                d = sorted_xy[src] - sorted_xy[dst]
+                mask = (np.einsum("ij,ij->i", d, d) <= r2) & (src != dst)
+                sources.append(src[mask])
+                destinations.append(dst[mask])
+
+                chunk_start = chunk_end
+
+    # back to the original node ids
+    src = order[np.concatenate(sources)]
+    dst = order[np.concatenate(destinations)]
+
+    return _sort_pairs(src, dst, n)
+
+
+def kdtree_pairs(xy: np.ndarray, node_range: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    find all (directed) pairs of points that are within `node_range`
+    of each other using a KD-tree (requires scipy)
+
+    :param xy: (n, 2) array of coordinates
+    :param node_range: maximum distance between two connected nodes
+    :return: (source ids, destination ids), sorted by source, then destination
+    """
+    try:
+        from scipy.spatial import cKDTree
+
+    except ImportError as e:
+        raise ImportError("the \"kdtree\" method requires scipy, use method=\"grid\" instead") from e
+
+    if len(xy) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    pairs = cKDTree(xy).query_pairs(node_range, output_type="ndarray").astype(np.int64)
+
+    # query_pairs only returns i < j, connections go both ways
+    src = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    dst = np.concatenate((pairs[:, 1], pairs[:, 0]))
+
+    return _sort_pairs(src, dst, len(xy))
+
+
+def neighbor_pairs(xy: np.ndarray, node_range: float, method: str = "grid") -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param method: grid | kdtree
+    """
+    match method:
+        case "grid":
+            return grid_pairs(xy, node_range)
+
+        case "kdtree":
+            return kdtree_pairs(xy, node_range)
+
+        case _:
+            raise ValueError("Invalid value for \"method\"")
+
+
+def build_node_connections(nodes: list[Vec2], node_range: float, method: str = "grid") -> dict[Vec2, list]:
+    """
+    build the `node_connections` dict (every node mapped to all nodes in range)
+
+    :param nodes: output of `generate_nodes`
+    :param node_range: maximum distance between two connected nodes
+    :param method: grid | kdtree
+    """
+    src, dst = neighbor_pairs(nodes_to_array(nodes), node_range, method)
+
+    # split the destinations by source
+    bounds = np.searchsorted(src, np.arange(len(nodes) + 1)).tolist()
+    dst = dst.tolist()
+
+    return {
+        node: [nodes[j] for j in dst[bounds[i]:bounds[i + 1]]] for i, node in enumerate(nodes)
+    }
@@ -1,16 +1,51 @@
 from typing import Callable, TypedDict
-from classes import Vec2
-import pygame as pg
+from renderers import Renderer, PygameRenderer
+from query_cache import ShortestPathTreeCache
+from search_stats import SearchStats, phase
+from requesters import request_many
+from graph_search import bfs_layers
+from exploration import explore
+from classes import Vec2, Vec2Array
+from graph import Graph
+import numpy as np
+import heapq
 import time
 
 
 DRAW_STEPS: bool = False
 
 
+def vec2_distance(a: Vec2, b: Vec2) -> float:
+    return (a - b).length
+
+
+def unwind(parents: dict[Vec2, Vec2 | None], node: Vec2) -> list[Vec2]:
+    """
+    follow the parents back to the root of the search
+
+    :return: [root, ..., node]
+    """
+    path: list[Vec2] = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+
+    path.reverse()
+    return path
+
+
+def path_length(path: list[Vec2]) -> float:
+    """
+    calculates the length of a path
+    """
+    points = Vec2Array.from_vec2s(path)
+    return float((points[1:] - points[:-1]).length.sum())
+
+
 class Node(TypedDict):
     name: Vec2
     hops: int
-    parent_chain: list["Node"]
+    parent: int
     connections: list[Vec2]
 
 
@@ -22,12 +57,25 @@ class PathCalculator:
             sleep_time: float,
             redraw_func: Callable,
             draw_path_func: Callable,
+            distance_func: Callable[[Vec2, Vec2], float] = vec2_distance,
+            renderer: Renderer = ...,
+            stats: SearchStats | None = None,
     ):
+        """
+        :param renderer: shows the progress, defaults to drawing with
+            redraw_func and draw_path_func
+        :param stats: filled in while searching, if given
+        """
         self.node_connections = node_connections
         self.visible_nodes = visible_nodes
-        self.draw_path = draw_path_func
         self.sleep_time = sleep_time
-        self.redraw = redraw_func
+        self.distance = distance_func
+        self.stats = stats
+
+        if renderer is ...:
+            renderer = PygameRenderer(redraw_func, draw_path_func)
+
+        self.renderer = renderer
 
     def calculate_path_1(
             self,
@@ -46,6 +94,9 @@ class PathCalculator:
 
         # tweaks
         connections = self.node_connections[origin]
+        if self.stats is not None:
+            self.stats.count_request(origin)
+            self.stats.frontier(len(path))
 
         # purely for visuals
         for node in connections:
@@ -63,9 +114,7 @@ class PathCalculator:
                 path.append(r_node)
 
                 if DRAW_STEPS:
-                    self.redraw()
-                    self.draw_path(path, (255, 0, 0))
-                    pg.display.flip()
+                    self.renderer.show_path(path, (255, 0, 0))
 
                 if r_node == target:
                     return path, True
@@ -96,6 +145,9 @@ class PathCalculator:
 
         # tweaks
         connections = self.node_connections[origin]
+        if self.stats is not None:
+            self.stats.count_request(origin)
+            self.stats.frontier(len(path))
 
         # purely for visuals
         for node in connections:
@@ -108,7 +160,9 @@ class PathCalculator:
             return path, True
 
         # prefer shorter paths
-        connections = sorted(connections, key=lambda n: (origin - n).length)
+        connections = sorted(connections, key=lambda n: self.distance(origin, n))
+        if self.stats is not None:
+            self.stats.sorts += 1
 
         for r_node in connections:
             if r_node not in to_avoid:
@@ -116,9 +170,7 @@ class PathCalculator:
                 path.append(r_node)
 
                 if DRAW_STEPS:
-                    self.redraw()
-                    self.draw_path(path, (0, 255, 0))
-                    pg.display.flip()
+                    self.renderer.show_path(path, (0, 255, 0))
 
                 if r_node == target:
                     return path, True
@@ -149,6 +201,9 @@ class PathCalculator:
 
         # tweaks
         connections = self.node_connections[origin]
+        if self.stats is not None:
+            self.stats.count_request(origin)
+            self.stats.frontier(len(path))
 
         # purely for visuals
         for node in connections:
@@ -161,7 +216,9 @@ class PathCalculator:
             return path, True
 
         # prefer shorter paths
-        connections = sorted(connections, key=lambda n: (origin - n).length)
+        connections = sorted(connections, key=lambda n: self.distance(origin, n))
+        if self.stats is not None:
+            self.stats.sorts += 1
 
         # # prefer longer paths
         connections = list(reversed(connections))
@@ -172,9 +229,7 @@ class PathCalculator:
                 path.append(r_node)
 
                 if DRAW_STEPS:
-                    self.redraw()
-                    self.draw_path(path, (0, 0, 255))
-                    pg.display.flip()
+                    self.renderer.show_path(path, (0, 0, 255))
 
                 if r_node == target:
                     return path, True
@@ -189,7 +244,42 @@ class PathCalculator:
         return path, False
 
 
-class AllKnowing:
+class Finder:
+    """
+    setup shared by the finders that get their connections from a requester
+    """
+    def __init__(
+            self,
+            node_connections: dict[Vec2, list],
+            visible_nodes: list[Vec2],
+            sleep_time: float,
+            redraw_func: Callable,
+            draw_path_func: Callable,
+            request_node_connections: Callable,
+            distance_func: Callable[[Vec2, Vec2], float] = vec2_distance,
+            renderer: Renderer = ...,
+            stats: SearchStats | None = None,
+    ):
+        """
+        :param renderer: shows the progress, defaults to drawing with
+            redraw_func and draw_path_func
+        :param stats: filled in while searching, if given
+        """
+        self._connection_requester = request_node_connections
+        self.visible_nodes = visible_nodes
+        self._distance = distance_func
+
+        self.stats = stats
+        if stats is not None:
+            self._connection_requester = stats.counting(request_node_connections)
+
+        if renderer is ...:
+            renderer = PygameRenderer(redraw_func, draw_path_func)
+
+        self._renderer = renderer
+
+
+class AllKnowing(Finder):
     points: list[Vec2]
     connections: dict[Vec2, Node]
     connections_from_target: dict[Vec2, Node]
@@ -202,12 +292,27 @@ class AllKnowing:
             redraw_func: Callable,
             draw_path_func: Callable,
             request_node_connections: Callable,
-
+            distance_func: Callable[[Vec2, Vec2], float] = vec2_distance,
+            renderer: Renderer = ...,
+            stats: SearchStats | None = None,
+            graph: Graph | None = None,
     ):
-        self._draw_path_func = draw_path_func
-        self._connection_requester = request_node_connections
-        self.visible_nodes = visible_nodes
-        self._redraw_func = redraw_func
+        """
+        :param graph: if the nodes are the ids of this graph, the layers
+            from the target are calculated on its arrays (`bfs_layers`)
+        """
+        super().__init__(
+            node_connections,
+            visible_nodes,
+            sleep_time,
+            redraw_func,
+            draw_path_func,
+            request_node_connections,
+            distance_func,
+            renderer,
+            stats,
+        )
+        self.graph = graph
 
         self.connections_from_target = {}
         self.connections = {}
@@ -217,13 +322,26 @@ class AllKnowing:
         """
         calculate the path
         """
-        self.request_all(self.connections, origin)
-        self.request_from_target(target, origin, self.connections_from_target)
+        # nothing from an earlier query may leak into this one
+        self.connections = {}
+        self.connections_from_target = {}
+
+        with phase(self.stats, "request_all"):
+            self.request_all(self.connections, origin)
+
+        with phase(self.stats, "request_from_target"):
+            self.request_from_target(target, origin, self.connections_from_target)
 
         if target not in self.connections:
             return  # target was not found
 
-        # calculate path
+        with phase(self.stats, "node_finder"):
+            return self.find_path(origin, target)
+
+    def find_path(self, origin: Vec2, target: Vec2) -> list[Vec2] | None:
+        """
+        walk from origin to target along the requested connections
+        """
         def node_finder(origin: Vec2, target: Vec2, path: list[Vec2], ignore: list[Vec2]) -> list[Vec2] | None:
             ignore.append(origin)
             this_node = self.connections_from_target[origin] if origin in self.connections_from_target else self.connections[origin]
@@ -240,85 +358,96 @@ class AllKnowing:
                 return None
 
             # sort by furthest along the line
+            if self.stats is not None:
+                self.stats.sorts += 1
+
             connections = list(sorted(connections, key=lambda e: self.connections_from_target[e]["hops"]))
 
             next_node = connections[0]
 
             path.append(next_node)
 
-            self._redraw_func()
-            self._draw_path_func(path)
-            pg.display.flip()
+            self._renderer.show_path(path)
 
             return node_finder(next_node, target, path, ignore)
 
         return node_finder(origin, target, [origin], [])
 
     def request_from_target(self, target: Vec2, origin: Vec2, to_append: dict, max_iterations: int = 300) -> None:
+        if self.graph is not None:
+            layers = self.graph_layers(target, origin, max_iterations)
+
+        else:
+            layers = self.requested_layers(target, origin, max_iterations)
+
+        for layer in layers:
+            nodes = layers[layer]
+            for node, connections in zip(nodes, request_many(self._connection_requester, nodes)):
+                to_append[node] = {
+                    "name": nodes,
+                    "hops": layer,
+                    "connections": connections
+                }
+
+    def requested_layers(self, target: Vec2, origin: Vec2, max_iterations: int) -> dict[int, list[Vec2]]:
+        """
+        nodes by number of hops from the target, up to the layer containing origin
+        """
         layers: dict[int, list[Vec2]] = {
             0: [target]
         }
-        all_points: list[Vec2] = [target]
+        all_points: set[Vec2] = {target}
         current_layer: int = 0
         while current_layer < max_iterations:
             if origin in layers[current_layer]:
                 break
 
             layers[current_layer + 1] = []
-            for node in layers[current_layer]:
-                new_nodes = self._connection_requester(node)
+            layer = layers[current_layer]
+            for node, new_nodes in zip(layer, request_many(self._connection_requester, layer)):
                 new_nodes = list(filter(lambda e: e not in all_points, new_nodes))
                 layers[current_layer + 1] += new_nodes
-                all_points += new_nodes
+                all_points.update(new_nodes)
+
+            # nothing left to reach (origin isn't connected to the target)
+            if not layers[current_layer + 1]:
+                del layers[current_layer + 1]
+                break
+
+            if self.stats is not None:
+                self.stats.frontier(len(layers[current_layer + 1]))
 
             current_layer += 1
 
-        for layer in layers:
-            nodes = layers[layer]
-            for node in nodes:
-                to_append[node] = {
-                    "name": nodes,
-                    "hops": layer,
-                    "connections": self._connection_requester(node)
-                }
+        return layers
 
-    def request_all(self, to_append: dict, origin: Vec2, ignore: list[Vec2] = ..., n=0) -> None:
+    def graph_layers(self, target: int, origin: int, max_iterations: int) -> dict[int, list[int]]:
         """
-        request all possible node connections
+        `requested_layers` on the arrays of the graph
         """
-        if ignore is ...:
-            ignore = []
-
-        ignore.append(origin)
-        if origin not in self.visible_nodes:
-            self.visible_nodes.append(origin)
+        _, layers = bfs_layers(self.graph, target, origin, max_iterations + 1)
+        if self.stats is not None:
+            self.stats.frontier(max(len(layer) for layer in layers))
 
-        points = self._connection_requester(origin)
+        return {hops: layer.tolist() for hops, layer in enumerate(layers)}
 
-        for point in points:
-            if point not in self.visible_nodes:
-                self.visible_nodes.append(point)
-
-            if point not in to_append:
-                to_append[point] = {
-                    "name": point,
-                    "hops": n+1,
-                    "connections": [],
-                }
-        if origin in to_append:
-            to_append[origin]["connections"] = points
-
-        # request all points from each point
-        for point in points:
-            if point not in ignore:
-                self.request_all(to_append, point, ignore, n+1)
+    def request_all(self, to_append: dict, origin: Vec2) -> None:
+        """
+        request all possible node connections
+        """
+        explore(origin, self._connection_requester, to_append, self.visible_nodes, stats=self.stats)
 
 
-class AllKnowing2:
+class AllKnowing2(Finder):
     points: list[Vec2]
     connections: dict[Vec2, Node]
     connections_from_target: dict[Vec2, Node]
 
+    # search tree rooted at the target. the "parent" of a node in
+    # `connections_from_target` is an index into these lists
+    tree_parents: list[int]
+    tree_distances: list[float]
+
     def __init__(
             self,
             node_connections: dict[Vec2, list],
@@ -327,36 +456,60 @@ class AllKnowing2:
             redraw_func: Callable,
             draw_path_func: Callable,
             request_node_connections: Callable,
-
+            distance_func: Callable[[Vec2, Vec2], float] = vec2_distance,
+            renderer: Renderer = ...,
+            stats: SearchStats | None = None,
     ):
-        self._draw_path_func = draw_path_func
-        self._connection_requester = request_node_connections
-        self.visible_nodes = visible_nodes
-        self._redraw_func = redraw_func
+        super().__init__(
+            node_connections,
+            visible_nodes,
+            sleep_time,
+            redraw_func,
+            draw_path_func,
+            request_node_connections,
+            distance_func,
+            renderer,
+            stats,
+        )
 
         self.connections_from_target = {}
         self.connections = {}
+        self.tree_distances = []
+        self.tree_parents = []
         self.points = []
 
     def calculate(self, origin: Vec2, target: Vec2) -> list[Vec2] | None:
         """
         calculate the path
         """
-        self.request_all(self.connections, origin)
-        self.request_from_target(target, origin, self.connections_from_target)
+        # nothing from an earlier query may leak into this one
+        self.connections = {}
+        self.connections_from_target = {}
+
+        with phase(self.stats, "request_all"):
+            self.request_all(self.connections, origin)
+
+        with phase(self.stats, "request_from_target"):
+            self.request_from_target(target, origin, self.connections_from_target)
 
         if target not in self.connections:
             return  # target was not found
 
-        def distance_from_parent_chain(parent_chain: list[Node]) -> float:
+        with phase(self.stats, "node_finder"):
+            return self.find_path(origin, target)
+
+    def find_path(self, origin: Vec2, target: Vec2) -> list[Vec2] | None:
+        """
+        walk from origin to target along the requested connections
+        """
+        def parent_distance(node: Node) -> float:
             """
-            calculate the distance to target based on a chain of nodes
+            distance from the target to the parent of a node (along the tree)
             """
-            s = 0
-            for i in range(len(parent_chain)-1):
-                s += (parent_chain[i]["name"] - parent_chain[i+1]["name"]).length
+            if node["parent"] < 0:
+                return 0
 
-            return s
+            return self.tree_distances[node["parent"]]
 
         # calculate path
         def node_finder(origin: Vec2, target: Vec2, path: list[Vec2], ignore: list[Vec2]) -> list[Vec2] | None:
@@ -375,86 +528,395 @@ class AllKnowing2:
                 return None
 
             # sort by furthest along the line
-            connections = list(sorted(connections, key=lambda e: distance_from_parent_chain(self.connections_from_target[e]["parent_chain"])))
+            if self.stats is not None:
+                self.stats.sorts += 1
+
+            connections = list(sorted(connections, key=lambda e: parent_distance(self.connections_from_target[e])))
 
             next_node = connections[0]
 
             path.append(next_node)
 
-            self._redraw_func()
-            self._draw_path_func(path)
-            pg.display.flip()
+            self._renderer.show_path(path)
 
             return node_finder(next_node, target, path, ignore)
 
         return node_finder(origin, target, [origin], [])
 
     def request_from_target(self, target: Vec2, origin: Vec2, to_append: dict, max_iterations: int = 300) -> None:
-        layers: dict[int, list[Node]] = {
-            0: [{
-                "name": target,
-                "hops": 0,
-                "parent_chain": [],
-            }]
+        # the tree is rebuilt for every request, entries of an older tree would be invalid
+        to_append.clear()
+        self.tree_parents = [-1]
+        self.tree_distances = [0]
+
+        # nodes are stored as (name, tree index)
+        layers: dict[int, list[tuple[Vec2, int]]] = {
+            0: [(target, 0)]
         }
-        all_points: list[Vec2] = [target]
+        all_points: set[Vec2] = {target}
         current_layer: int = 0
         while current_layer < max_iterations:
-            if origin in [n["name"] for n in layers[current_layer]]:
+            if origin in (name for name, _ in layers[current_layer]):
                 break
 
             layers[current_layer + 1] = []
-            for node in layers[current_layer]:
-                new_nodes = self._connection_requester(node["name"])
+            layer = layers[current_layer]
+            for (name, index), new_nodes in zip(layer, request_many(self._connection_requester, [name for name, _ in layer])):
                 new_nodes = list(filter(lambda e: e not in all_points, new_nodes))
-                all_points += new_nodes
+                all_points.update(new_nodes)
 
-                new_nodes = [{
-                    "name": n_node,
-                    "hops": current_layer + 1,
-                    "parent_chain": node["parent_chain"] + [node],
-                } for n_node in new_nodes]
-                layers[current_layer + 1] += new_nodes
+                for n_node in new_nodes:
+                    layers[current_layer + 1].append((n_node, len(self.tree_parents)))
+                    self.tree_parents.append(index)
+                    self.tree_distances.append(self.tree_distances[index] + self._distance(name, n_node))
+
+            # nothing left to reach (origin isn't connected to the target)
+            if not layers[current_layer + 1]:
+                del layers[current_layer + 1]
+                break
+
+            if self.stats is not None:
+                self.stats.frontier(len(layers[current_layer + 1]))
 
             current_layer += 1
 
         for layer in layers:
-            nodes = layers[layer]
-            for node in nodes:
-                to_append[node["name"]] = {
-                    "name": node["name"],
+            names = [name for name, _ in layers[layer]]
+            for (name, index), connections in zip(layers[layer], request_many(self._connection_requester, names)):
+                to_append[name] = {
+                    "name": name,
                     "hops": layer,
-                    "parent_chain": node["parent_chain"],
-                    "connections": self._connection_requester(node["name"]),
+                    "parent": self.tree_parents[index],
+                    "connections": connections,
                 }
 
-    def request_all(self, to_append: dict, origin: Vec2, ignore: list[Vec2] = ..., n=0) -> None:
+    def request_all(self, to_append: dict, origin: Vec2) -> None:
         """
         request all possible node connections
         """
-        if ignore is ...:
-            ignore = []
+        explore(origin, self._connection_requester, to_append, self.visible_nodes, stats=self.stats)
+
+
+class DijkstraFinder(Finder):
+    """
+    exact shortest path (dijkstra with a binary heap)
+    """
+    def heuristic(self, node: Vec2, target: Vec2) -> float:
+        """
+        estimated distance from node to target (0 = plain dijkstra)
+        """
+        return 0
+
+    def calculate(self, origin: Vec2, target: Vec2) -> list[Vec2] | None:
+        """
+        calculate the path
+        """
+        start = time.perf_counter()
+        _, parents = self._search(origin, {target}, target)
+
+        if self.stats is not None:
+            self.stats.add_time("search", time.perf_counter() - start)
 
-        ignore.append(origin)
-        if origin not in self.visible_nodes:
-            self.visible_nodes.append(origin)
+        if target not in parents:
+            return  # target was not found
 
-        points = self._connection_requester(origin)
+        return unwind(parents, target)
 
-        for point in points:
-            if point not in self.visible_nodes:
-                self.visible_nodes.append(point)
+    def calculate_many(self, pairs: list[tuple[Vec2, Vec2]]) -> tuple[np.ndarray, list[list[Vec2] | None]]:
+        """
+        calculate the paths of many (origin, target) pairs, with one search per
+        distinct origin (the heuristic isn't used, a search serves many targets)
+
+        :return: (lengths, paths) in the order of pairs, inf / None if not found
+        """
+        targets: dict[Vec2, set[Vec2]] = {}
+        for origin, target in pairs:
+            targets.setdefault(origin, set()).add(target)
+
+        with phase(self.stats, "search"):
+            trees = {origin: self._tree(origin, origin_targets) for origin, origin_targets in targets.items()}
+
+        lengths = np.full(len(pairs), np.inf)
+        paths: list[list[Vec2] | None] = []
+        for i, (origin, target) in enumerate(pairs):
+            distances, parents = trees[origin]
+            if target not in parents:
+                paths.append(None)
+                continue
+
+            lengths[i] = distances[target]
+            paths.append(unwind(parents, target))
+
+        return lengths, paths
+
+    def distance_matrix(self, origins: list[Vec2], targets: list[Vec2]) -> np.ndarray:
+        """
+        :return: (len(origins), len(targets)) path lengths, inf if not found
+        """
+        matrix = np.full((len(origins), len(targets)), np.inf)
+
+        rows: dict[Vec2, np.ndarray] = {}
+        for i, origin in enumerate(origins):
+            if origin not in rows:
+                distances, parents = self._tree(origin, set(targets))
+                rows[origin] = np.array([
+                    distances[target] if target in parents else np.inf for target in targets
+                ])
+
+            matrix[i] = rows[origin]
+
+        return matrix
+
+    def _tree(self, origin: Vec2, targets: set[Vec2]) -> tuple[dict[Vec2, float], dict[Vec2, Vec2 | None]]:
+        """
+        dijkstra from origin until all targets are settled (see `_search`)
+        """
+        return self._search(origin, targets)
+
+    def _search(
+            self,
+            origin: Vec2,
+            targets: set[Vec2],
+            target: Vec2 = ...,
+    ) -> tuple[dict[Vec2, float], dict[Vec2, Vec2 | None]]:
+        """
+        search from origin until all targets are settled
+
+        :param target: guide the search towards it with the heuristic and
+            show its progress (the single target of `calculate`)
+        :return: (distances, parents) of the settled nodes only
+        """
+        distances: dict[Vec2, float] = {origin: 0}
+        parents: dict[Vec2, Vec2 | None] = {origin: None}
+        settled: dict[Vec2, float] = {}
+        settled_parents: dict[Vec2, Vec2 | None] = {}
+        remaining = set(targets)
+        visible: set[Vec2] = set(self.visible_nodes) if target is not ... else set()
+
+        def heuristic(node: Vec2) -> float:
+            return 0 if target is ... else self.heuristic(node, target)
+
+        # (estimated total, insertion counter, node), the counter breaks ties
+        # since Vec2 isn't comparable
+        counter = 0
+        heap: list[tuple[float, int, Vec2]] = [(heuristic(origin), counter, origin)]
+        while heap and remaining:
+            if self.stats is not None:
+                self.stats.frontier(len(heap))
+
+            _, _, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+
+            settled[node] = distances[node]
+            settled_parents[node] = parents[node]
+            remaining.discard(node)
+
+            # purely for visuals
+            if target is not ... and node not in visible:
+                visible.add(node)
+                self.visible_nodes.append(node)
+
+            if not remaining:
+                break
+
+            for other in self._connection_requester(node):
+                if other in settled:
+                    continue
+
+                distance = distances[node] + self._distance(node, other)
+                if distance < distances.get(other, float("inf")):
+                    distances[other] = distance
+                    parents[other] = node
+                    counter += 1
+                    heapq.heappush(heap, (distance + heuristic(other), counter, other))
+
+            if DRAW_STEPS and target is not ...:
+                self._renderer.show_path(unwind(parents, node))
+
+        return settled, settled_parents
+
+
+class AStarFinder(DijkstraFinder):
+    """
+    exact shortest path (A* with the euclidean distance as heuristic)
+    """
+    def heuristic(self, node: Vec2, target: Vec2) -> float:
+        return self._distance(node, target)
+
+
+class BidirectionalFinder(Finder):
+    """
+    exact shortest path, dijkstra from origin (like `request_all`) and
+    from target (like `request_from_target`) at the same time, stopping
+    once the two searches meet
+    """
+    def potential(self, node: Vec2, origin: Vec2, target: Vec2) -> float:
+        """
+        potential of the forward search, the backward search uses the negative
+        (0 = plain bidirectional dijkstra)
+        """
+        return 0
+
+    def calculate(self, origin: Vec2, target: Vec2) -> list[Vec2] | None:
+        """
+        calculate the path
+        """
+        # index 0 = forward (from origin), 1 = backward (from target)
+        distances: tuple[dict[Vec2, float], dict[Vec2, float]] = ({origin: 0}, {target: 0})
+        parents: tuple[dict[Vec2, Vec2 | None], dict[Vec2, Vec2 | None]] = ({origin: None}, {target: None})
+        settled: tuple[set[Vec2], set[Vec2]] = (set(), set())
+        signs = (1, -1)
+
+        counter = 0
+        heaps: tuple[list, list] = (
+            [(self.potential(origin, origin, target), counter, origin)],
+            [(-self.potential(target, origin, target), counter, target)],
+        )
+
+        visible: set[Vec2] = set(self.visible_nodes)
+
+        # length of the best path found so far and where the searches met
+        best = float("inf")
+        meeting: Vec2 | None = None
+        stats = self.stats
+        start = time.perf_counter()
+        while heaps[0] and heaps[1]:
+            if stats is not None:
+                stats.frontier(len(heaps[0]) + len(heaps[1]))
+
+            # the searches can't find anything shorter anymore
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+
+            # always expand the side with the smaller key
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            _, _, node = heapq.heappop(heaps[side])
+            if node in settled[side]:
+                continue
+
+            settled[side].add(node)
+
+            # purely for visuals
+            if node not in visible:
+                visible.add(node)
+                self.visible_nodes.append(node)
+
+            own_distances, other_distances = distances[side], distances[1 - side]
+            for other in self._connection_requester(node):
+                if other in settled[side]:
+                    continue
+
+                distance = own_distances[node] + self._distance(node, other)
+                if distance < own_distances.get(other, float("inf")):
+                    own_distances[other] = distance
+                    parents[side][other] = node
+                    counter += 1
+                    key = distance + signs[side] * self.potential(other, origin, target)
+                    heapq.heappush(heaps[side], (key, counter, other))
+
+                # the searches touch
+                if other in other_distances and own_distances[other] + other_distances[other] < best:
+                    best = own_distances[other] + other_distances[other]
+                    meeting = other
+
+            if node in other_distances and own_distances[node] + other_distances[node] < best:
+                best = own_distances[node] + other_distances[node]
+                meeting = node
+
+            # only the forward search has a path from origin to show
+            if DRAW_STEPS and side == 0:
+                self._renderer.show_path(unwind(parents[0], node))
+
+        if stats is not None:
+            stats.add_time("search", time.perf_counter() - start)
+
+        if meeting is None:
+            return  # target was not found
+
+        # origin -> meeting + meeting -> target
+        path = unwind(parents[0], meeting)
+        node = parents[1][meeting]
+        while node is not None:
+            path.append(node)
+            node = parents[1][node]
+
+        return path
 
-            if point not in to_append:
-                to_append[point] = {
-                    "name": point,
-                    "hops": n+1,
-                    "connections": [],
-                }
-        if origin in to_append:
-            to_append[origin]["connections"] = points
 
-        # request all points from each point
-        for point in points:
-            if point not in ignore:
-                self.request_all(to_append, point, ignore, n+1)
+class BidirectionalAStarFinder(BidirectionalFinder):
+    """
+    bidirectional A*, with the average of both euclidean heuristics as
+    potential (keeps the stopping rule of bidirectional dijkstra correct)
+    """
+    def potential(self, node: Vec2, origin: Vec2, target: Vec2) -> float:
+        return (self._distance(node, target) - self._distance(node, origin)) / 2
+
+
+class CachedTreeFinder(Finder):
+    """
+    exact shortest paths from a cache of shortest path trees (see
+    `query_cache`), repeated queries towards the same target only cost
+    O(path length). the graph is converted once, connections are never requested.
+    """
+    def __init__(
+            self,
+            node_connections: dict[Vec2, list],
+            visible_nodes: list[Vec2],
+            sleep_time: float,
+            redraw_func: Callable,
+            draw_path_func: Callable,
+            request_node_connections: Callable,
+            distance_func: Callable[[Vec2, Vec2], float] = vec2_distance,
+            renderer: Renderer = ...,
+            memory_budget: int = 64_000_000,
+            stats: SearchStats | None = None,
+    ):
+        """
+        :param memory_budget: maximum size of the cached trees in bytes
+        :param stats: connections are never requested, so only the time is measured
+        """
+        super().__init__(
+            node_connections,
+            visible_nodes,
+            sleep_time,
+            redraw_func,
+            draw_path_func,
+            request_node_connections,
+            distance_func,
+            renderer,
+            stats,
+        )
+
+        self.graph, self._ids = Graph.from_node_connections(node_connections)
+        self._nodes = list(node_connections)
+        self.cache = ShortestPathTreeCache(self.graph, memory_budget)
+
+    def calculate(self, origin: Vec2, target: Vec2) -> list[Vec2] | None:
+        """
+        calculate the path
+        """
+        with phase(self.stats, "search"):
+            path = self.cache.path(self._ids[origin], self._ids[target])
+        if path is None:
+            return  # target was not found
+
+        path = [self._nodes[node] for node in path]
+
+        # purely for visuals
+        visible = set(self.visible_nodes)
+        self.visible_nodes.extend(node for node in path if node not in visible)
+
+        return path
+
+
+# all finders with a `calculate(origin, target)` method, by name
+FINDERS: dict[str, type] = {
+    "AllKnowing": AllKnowing,
+    "AllKnowing2": AllKnowing2,
+    "Dijkstra": DijkstraFinder,
+    "AStar": AStarFinder,
+    "Bidirectional": BidirectionalFinder,
+    "BidirectionalAStar": BidirectionalAStarFinder,
+    "CachedTree": CachedTreeFinder,
+}
@@ -0,0 +1,99 @@
+"""
+Author:
+Nilusink
+
+shorten paths by skipping nodes, as long as the skipped-to node is in range
+"""
+from renderers import NullRenderer, Renderer
+from classes import Vec2, Vec2Array
+import numpy as np
+import time
+
+
+def _distances(points: Vec2Array, anchor: int, start: int) -> np.ndarray:
+    """
+    distances from points[anchor] to points[start:]
+    """
+    dx = points.x[start:] - points.x[anchor]
+    dy = points.y[start:] - points.y[anchor]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def shorten_path(
+        path: list[Vec2],
+        node_range: float,
+        renderer: Renderer = ...,
+        any_shortcut: bool = False,
+        sleep_time: float = 0,
+) -> list[Vec2]:
+    """
+    shorten a given path
+
+    :param node_range: maximum length of a shortcut
+    :param renderer: shows every shortcut, draws nothing by default
+    :param any_shortcut: find the shortest path using any combination of
+        shortcuts, instead of greedily jumping to the furthest node in range
+    :param sleep_time: pause after every shortcut (for visuals)
+    """
+    if len(path) < 3:
+        return path
+
+    if renderer is ...:
+        renderer = NullRenderer()
+
+    points = Vec2Array.from_vec2s(path)
+
+    if any_shortcut:
+        return _shortest_shortcuts(path, points, node_range)
+
+    result: list[Vec2] = []
+    anchor = 0
+    while anchor < len(path) - 2:
+        result.append(path[anchor])
+
+        # the furthest node along the path that is still in range
+        in_range = np.nonzero(_distances(points, anchor, anchor + 2) <= node_range)[0]
+        if len(in_range):
+            anchor += 2 + int(in_range[-1])
+
+            renderer.show_path(result + path[anchor:])
+            time.sleep(sleep_time)
+
+        else:
+            anchor += 1
+
+    return result + path[anchor:]
+
+
+def _shortest_shortcuts(path: list[Vec2], points: Vec2Array, node_range: float) -> list[Vec2]:
+    """
+    shortest sub-sequence of path (same first and last node), where every
+    step is at most node_range long
+    """
+    n = len(path)
+    lengths = np.full(n, np.inf)
+    parents = np.full(n, -1)
+    lengths[0] = 0
+
+    # the nodes are already in topological order, relax all shortcuts of every node
+    for i in range(n - 1):
+        distances = _distances(points, i, i + 1)
+        candidates = lengths[i] + distances
+
+        # the next node of the original path is always allowed
+        in_range = distances <= node_range
+        in_range[0] = True
+
+        better = in_range & (candidates < lengths[i + 1:])
+
+        lengths[i + 1:][better] = candidates[better]
+        parents[i + 1:][better] = i
+
+    result: list[Vec2] = []
+    node = n - 1
+    while node >= 0:
+        result.append(path[node])
+        node = int(parents[node])
+
+    result.reverse()
+    return result
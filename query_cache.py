@@ -0,0 +1,135 @@
+"""
+Author:
+Nilusink
+
+cache of shortest path trees for repeated queries on one graph
+"""
+from graph_search import dijkstra, unwind
+from collections import OrderedDict
+from typing import NamedTuple
+from graph import Graph
+import numpy as np
+
+
+class PathTree(NamedTuple):
+    """
+    shortest path tree rooted at a target. following `parents` from
+    any settled node leads to the target along a shortest path.
+    a complete tree has everything reachable settled, nodes that aren't
+    can't reach the target at all
+    """
+    distances: np.ndarray
+    parents: np.ndarray
+    settled: np.ndarray
+    complete: bool
+
+    @property
+    def nbytes(self) -> int:
+        return self.distances.nbytes + self.parents.nbytes + self.settled.nbytes
+
+
+class ShortestPathTreeCache:
+    """
+    shortest path trees keyed by target, least recently used trees are
+    evicted once the memory budget is exceeded
+    """
+    def __init__(self, graph: Graph, memory_budget: int = 64_000_000, full_trees: bool = True) -> None:
+        """
+        :param memory_budget: maximum size of all stored trees in bytes
+        :param full_trees: always build the complete tree. if False, a tree
+            is only built until the queried origin is settled (cheaper, but
+            other origins may miss)
+        """
+        self.graph = graph
+        self.memory_budget = memory_budget
+        self.full_trees = full_trees
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self._trees: OrderedDict[int, PathTree] = OrderedDict()
+        self._nbytes: int = 0
+        self._version = graph.version
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def __contains__(self, target: int) -> bool:
+        return target in self._trees
+
+    def invalidate(self, target: int = ...) -> None:
+        """
+        drop the tree of one target (default: all trees)
+        """
+        if target is ...:
+            self._trees.clear()
+            self._nbytes = 0
+
+        elif target in self._trees:
+            self._nbytes -= self._trees.pop(target).nbytes
+
+        self._version = self.graph.version
+
+    def tree(self, target: int, origin: int = ...) -> PathTree:
+        """
+        get the tree rooted at target (built if needed)
+
+        :param origin: the tree must at least reach this node
+        """
+        if self.graph.version != self._version:
+            self.invalidate()
+
+        tree = self._trees.get(target)
+        if tree is not None and (origin is ... or tree.complete or tree.settled[origin]):
+            self.hits += 1
+            self._trees.move_to_end(target)
+            return tree
+
+        self.misses += 1
+        stop_at = ... if self.full_trees or origin is ... else {origin}
+        distances, parents, settled = dijkstra(self.graph, target, stop_at)
+
+        # a search that stopped without settling origin ran out of nodes
+        complete = stop_at is ... or not settled[origin]
+        tree = PathTree(distances, parents, settled, complete)
+
+        self.invalidate(target)
+        self._trees[target] = tree
+        self._nbytes += tree.nbytes
+        self._evict()
+
+        return tree
+
+    def path(self, origin: int, target: int) -> list[int] | None:
+        """
+        shortest path from origin to target, O(path length) for cached targets
+        """
+        tree = self.tree(target, origin)
+        if not tree.settled[origin]:
+            return None  # target was not found
+
+        return unwind(tree.parents, origin)
+
+    def distance(self, origin: int, target: int) -> float:
+        return float(self.tree(target, origin).distances[origin])
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "trees": len(self._trees),
+            "nbytes": self._nbytes,
+        }
+
+    def _evict(self) -> None:
+        # the most recent tree is always kept, even if it is over budget on its own
+        while self._nbytes > self.memory_budget and len(self._trees) > 1:
+            _, tree = self._trees.popitem(last=False)
+            self._nbytes -= tree.nbytes
+            self.evictions += 1
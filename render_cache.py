@@ -0,0 +1,202 @@
+"""
+Author:
+Nilusink
+
+cached background for drawing the search: the static layers are drawn
+once to an off-screen surface, every frame only repairs and updates the
+areas that changed (dirty rects). all connections are drawn in one batch
+"""
+from typing import Callable
+from classes import Vec2
+import pygame as pg
+import numpy as np
+
+
+# number of different colors connections are drawn in
+QUALITY_LEVELS: int = 64
+
+# average edge length (pixels) from which `pg.draw.line` is faster than
+# rasterizing with numpy (measured with bench_edges.py)
+LINE_STEPS: int = 75
+
+
+class RenderCache:
+    """
+    background = connections (drawn once) + visible nodes (drawn when they
+    show up). everything drawn with `draw` is an overlay that is removed
+    again by the next `redraw`
+    """
+    def __init__(
+            self,
+            screen: pg.Surface,
+            draw_background: Callable[[pg.Surface], None],
+            draw_node: Callable[[pg.Surface, Vec2], pg.Rect],
+            visible_nodes: list[Vec2],
+    ) -> None:
+        """
+        :param draw_background: draws the static layer (connections)
+        :param draw_node: draws one visible node, returns the changed area
+        :param visible_nodes: only ever appended to by the finders
+        """
+        self.screen = screen
+        self.background = pg.Surface(screen.get_size())
+        draw_background(self.background)
+
+        self._draw_node = draw_node
+        self._visible_nodes = visible_nodes
+        self._n_drawn = 0
+
+        self._overlay: list[pg.Rect] = []
+        self._dirty: list[pg.Rect] = [screen.get_rect()]
+        self._full = True
+
+    def redraw(self) -> None:
+        """
+        remove the overlay and add new visible nodes
+        """
+        new_nodes = self._visible_nodes[self._n_drawn:]
+        self._n_drawn += len(new_nodes)
+
+        if self._full:
+            for node in new_nodes:
+                self._draw_node(self.background, node)
+
+            self.screen.blit(self.background, (0, 0))
+            self._overlay = []
+            return
+
+        rects = self._overlay + [self._draw_node(self.background, node) for node in new_nodes]
+        for rect in rects:
+            self.screen.blit(self.background, rect, rect)
+
+        self._dirty += rects
+        self._overlay = []
+
+    def draw(self, draw_func: Callable[..., pg.Rect], *args, **kwargs) -> pg.Rect:
+        """
+        call a `pg.draw` function on the screen as part of the overlay
+        """
+        rect = draw_func(self.screen, *args, **kwargs)
+        self._overlay.append(rect)
+        self._dirty.append(rect)
+        return rect
+
+    def flip(self) -> None:
+        """
+        show only the changed areas
+        """
+        if self._full:
+            pg.display.flip()
+
+        else:
+            pg.display.update(self._dirty)
+
+        self._dirty = []
+        self._full = False
+
+
+def edge_colors(lengths: np.ndarray, node_range: float, levels: int = QUALITY_LEVELS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    color of every connection based on its length: green for short ones,
+    red for ones close to `node_range`
+
+    :return: (color bucket of every edge, (levels, 3) color of every bucket)
+    """
+    quality = np.clip(1 - lengths / node_range, 0, 1)
+    buckets = np.minimum((quality * levels).astype(np.intp), levels - 1)
+
+    centers = (np.arange(levels) + .5) / levels
+    palette = np.stack((255 * (1 - centers), 255 * centers, np.zeros(levels)), axis=1).astype(np.uint8)
+
+    return buckets, palette
+
+
+def draw_edges(surface: pg.Surface, xy: np.ndarray, edges: np.ndarray, buckets: np.ndarray, palette: np.ndarray) -> None:
+    """
+    draw all edges as 1 pixel lines at once instead of one `pg.draw.line`
+    call each: the lines are rasterized with numpy and written to the
+    surface in a single assignment. long edges (more than `LINE_STEPS`
+    pixels on average) are drawn with `pg.draw.line` instead, one color
+    bucket after the other
+
+    :param xy: (n, 2) node coordinates
+    :param edges: (E, 2) node ids
+    :param buckets: (E,) color bucket of every edge, see `edge_colors`
+    """
+    if not len(edges):
+        return
+
+    # grouped by color, shorter (greener) edges end up on top
+    # (a stable sort of small integers is a radix sort)
+    order = np.argsort(buckets.astype(np.uint8 if len(palette) <= 256 else np.intp), kind="stable")
+    edges, buckets = edges[order], buckets[order]
+
+    xy = xy.astype(np.float32)
+    starts = xy[edges[:, 0]]
+    deltas = xy[edges[:, 1]] - starts
+
+    # one point per pixel along the longer axis
+    steps = np.ceil(np.abs(deltas).max(axis=1)).astype(np.int32) + 1
+    n_points = int(steps.sum())
+
+    # the pixels are written as 32 bit values
+    if n_points > LINE_STEPS * len(edges) or surface.get_bytesize() != 4:
+        _draw_lines(surface, xy, edges, buckets, palette)
+        return
+
+    # number of the point on its edge (0 ... steps - 1)
+    k = np.ones(n_points, dtype=np.int32)
+    k[0] = 0
+    k[np.cumsum(steps[:-1])] = 1 - steps[:-1]
+    k = np.cumsum(k, dtype=np.int32)
+
+    # (repeating per edge values is a lot faster than indexing them per point)
+    increments = deltas / np.maximum(steps - 1, 1)[:, None].astype(np.float32)
+    starts += .5
+    x = np.repeat(increments[:, 0], steps)
+    x *= k
+    x += np.repeat(starts[:, 0], steps)
+    y = np.repeat(increments[:, 1], steps)
+    y *= k
+    y += np.repeat(starts[:, 1], steps)
+    x = np.floor(x, out=x).astype(np.intp)
+    y = np.floor(y, out=y).astype(np.intp)
+
+    colors = np.repeat(_surface_colors(surface, palette)[buckets], steps)
+
+    # lines between two nodes on the surface stay on it
+    width, height = surface.get_size()
+    if len(xy) and (xy.min() < 0 or xy[:, 0].max() >= width or xy[:, 1].max() >= height):
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        x, y, colors = x[inside], y[inside], colors[inside]
+
+    # index into the flat pixel buffer (faster than a 2d index)
+    y *= surface.get_pitch() // surface.get_bytesize()
+    y += x
+
+    pixels = np.frombuffer(surface.get_buffer(), np.uint32)
+    pixels[y] = colors
+
+    # unlock the surface
+    del pixels
+
+
+def _surface_colors(surface: pg.Surface, palette: np.ndarray) -> np.ndarray:
+    """
+    palette as pixel values of the surface
+    """
+    return np.array([surface.map_rgb(color) for color in palette.tolist()], dtype=np.uint32)
+
+
+def _draw_lines(surface: pg.Surface, xy: np.ndarray, edges: np.ndarray, buckets: np.ndarray, palette: np.ndarray) -> None:
+    """
+    one `pg.draw.line` per edge, edges sorted by color bucket
+    """
+    lines = xy[edges].tolist()
+    bounds = (np.flatnonzero(np.diff(buckets)) + 1).tolist()
+
+    draw_line = pg.draw.line
+    for start, end in zip([0, *bounds], [*bounds, len(edges)]):
+        color = palette[buckets[start]].tolist()
+        for a, b in lines[start:end]:
+            draw_line(surface, color, a, b)
@@ -0,0 +1,124 @@
+"""
+Author:
+Nilusink
+"""
+from typing import Callable
+import time
+
+
+class Renderer:
+    """
+    how the finders show their progress, the base class draws nothing
+    """
+    def redraw(self) -> None:
+        """
+        draw the background (nodes, connections)
+        """
+
+    def draw_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        """
+        draw a path on top of the background
+        """
+
+    def flip(self) -> None:
+        """
+        show the drawn frame
+        """
+
+    def show_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        """
+        draw a complete frame with the given path
+        """
+        self.redraw()
+        self.draw_path(path, color)
+        self.flip()
+
+
+class NullRenderer(Renderer):
+    """
+    draws nothing, for headless runs and timing
+    """
+    def show_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        pass
+
+
+class PygameRenderer(Renderer):
+    """
+    draws with the redraw / draw_path functions from main
+    """
+    def __init__(self, redraw_func: Callable, draw_path_func: Callable, flip_func: Callable = ...) -> None:
+        """
+        :param flip_func: shows the frame, defaults to `pg.display.flip`
+        """
+        self._redraw_func = redraw_func
+        self._draw_path_func = draw_path_func
+        self._flip_func = flip_func
+
+    def redraw(self) -> None:
+        self._redraw_func()
+
+    def draw_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        if color is ...:
+            self._draw_path_func(path)
+
+        else:
+            self._draw_path_func(path, color)
+
+    def flip(self) -> None:
+        if self._flip_func is not ...:
+            self._flip_func()
+            return
+
+        import pygame as pg
+
+        pg.display.flip()
+
+
+class ThrottledRenderer(Renderer):
+    """
+    forwards at most `max_fps` frames per second to another renderer,
+    all other frames are skipped
+    """
+    def __init__(self, renderer: Renderer, max_fps: float = 30) -> None:
+        self.renderer = renderer
+        self._frame_time = 1 / max_fps
+        self._last_frame = -float("inf")
+
+    def redraw(self) -> None:
+        self.renderer.redraw()
+
+    def draw_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        self.renderer.draw_path(path, color)
+
+    def flip(self) -> None:
+        self.renderer.flip()
+
+    def show_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        now = time.perf_counter()
+        if now - self._last_frame < self._frame_time:
+            return
+
+        self._last_frame = now
+        self.renderer.show_path(path, color)
+
+
+class ConvertingRenderer(Renderer):
+    """
+    converts every path before passing it on to another renderer
+    (e.g. integer node ids to `Vec2`, see `graph.graph_finder`)
+    """
+    def __init__(self, renderer: Renderer, convert: Callable[[list], list]) -> None:
+        self.renderer = renderer
+        self._convert = convert
+
+    def redraw(self) -> None:
+        self.renderer.redraw()
+
+    def draw_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        self.renderer.draw_path(self._convert(path), color)
+
+    def flip(self) -> None:
+        self.renderer.flip()
+
+    def show_path(self, path: list, color: tuple[int, int, int] = ...) -> None:
+        self.renderer.show_path(self._convert(path), color)
@@ -0,0 +1,97 @@
+"""
+Author:
+Nilusink
+
+connection requesters for slow sources (e.g. a remote node reporting its
+neighbors): a cache in front of the source and batched requests for a
+whole frontier at once
+"""
+from typing import Callable, Hashable, Iterable
+from collections import OrderedDict
+import time
+
+
+def request_many(request_node_connections: Callable, nodes: list) -> list[list]:
+    """
+    connections of all nodes, in one batch if the requester supports it
+    (has a `request_many` method), one request per node otherwise
+    """
+    if not nodes:
+        return []
+
+    batched = getattr(request_node_connections, "request_many", None)
+    if batched is not None:
+        return batched(nodes)
+
+    return [request_node_connections(node) for node in nodes]
+
+
+class LatencySource:
+    """
+    simulated remote source: every round trip takes `latency` seconds,
+    no matter if it is for one node or a whole batch
+    """
+    def __init__(self, node_connections: dict, latency: float = .001) -> None:
+        self.node_connections = node_connections
+        self.latency = latency
+        self.round_trips = 0
+
+    def __call__(self, node: Hashable) -> list:
+        self.round_trips += 1
+        time.sleep(self.latency)
+        return self.node_connections[node]
+
+    def request_many(self, nodes: Iterable[Hashable]) -> list[list]:
+        nodes = list(nodes)
+        if not nodes:
+            return []
+
+        self.round_trips += 1
+        time.sleep(self.latency)
+        return [self.node_connections[node] for node in nodes]
+
+
+class CachingRequester:
+    """
+    asks the source for every node at most once (as long as it is cached)
+    and only for the nodes that aren't cached. the least recently used
+    entries are dropped once more than `max_size` nodes are cached.
+    """
+    def __init__(self, source: Callable, max_size: int = 100_000) -> None:
+        """
+        :param source: connection requester, optionally with `request_many`
+        """
+        self.source = source
+        self.max_size = max_size
+        self._cache: OrderedDict[Hashable, list] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, node: Hashable) -> list:
+        return self.request_many([node])[0]
+
+    def request_many(self, nodes: Iterable[Hashable]) -> list[list]:
+        nodes = list(nodes)
+
+        # every missing node only once, even if it is in nodes multiple times
+        missing = [node for node in dict.fromkeys(nodes) if node not in self._cache]
+        self.misses += len(missing)
+        self.hits += len(nodes) - len(missing)
+
+        if missing:
+            for node, connections in zip(missing, request_many(self.source, missing)):
+                self._cache[node] = connections
+
+        out: list[list] = []
+        for node in nodes:
+            self._cache.move_to_end(node)
+            out.append(self._cache[node])
+
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+        return out
+
+    def clear(self) -> None:
+        self._cache.clear()
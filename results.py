@@ -0,0 +1,332 @@
+"""
+Author:
+Nilusink
+
+buffered results logging: one record per finder and trial, written in
+batches to csv or to an append-only binary record file, and followed
+while they are written
+"""
+from typing import Iterable
+import numpy as np
+import time
+import abc
+import os
+import csv
+
+
+# expanded is -1 if it wasn't counted
+FIELDS: list[str] = ["seed", "n", "node_range", "finder", "found", "time", "length", "expanded", "win"]
+
+# one record of the binary format (fixed size, so files can be appended to and memory-mapped)
+RECORD_DTYPE: np.dtype = np.dtype([
+    ("seed", "<i8"),
+    ("n", "<i8"),
+    ("node_range", "<f8"),
+    ("finder", "S24"),
+    ("found", "?"),
+    ("time", "<f8"),
+    ("length", "<f8"),
+    ("expanded", "<i8"),
+    ("win", "?"),
+])
+
+
+class ResultsSink(abc.ABC):
+    """
+    collects records and writes them in batches of `buffer_size`, or
+    once `flush_interval` seconds passed since the last write
+    """
+    def __init__(
+            self,
+            path: str,
+            buffer_size: int = 1_000,
+            append: bool = True,
+            flush_interval: float = ...,
+    ) -> None:
+        """
+        :param append: add to an existing file instead of replacing it
+        :param flush_interval: seconds, only the buffer size counts by default
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer: list[dict] = []
+        self._last_flush = time.monotonic()
+
+        if not append and os.path.exists(path):
+            os.remove(path)
+
+    def __enter__(self) -> "ResultsSink":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def write(self, record: dict) -> None:
+        """
+        :param record: values for all of `FIELDS` (others are ignored),
+            length is None if no path was found
+        """
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+        elif self.flush_interval is not ... and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def write_many(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._write(self._buffer)
+            self._buffer = []
+
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+
+    # internal functions
+    @abc.abstractmethod
+    def _write(self, records: list[dict]) -> None:
+        ...
+
+
+class NullSink(ResultsSink):
+    """
+    throws everything away
+    """
+    def __init__(self) -> None:
+        super().__init__("", 1)
+
+    def _write(self, records: list[dict]) -> None:
+        pass
+
+
+class CsvSink(ResultsSink):
+    """
+    appends to a csv file with a header line. an existing file with a
+    different header (e.g. the old header-less results.csv) is moved to
+    a free "<name>.<i>.csv" first, so the two formats never get mixed
+    """
+    def __init__(
+            self,
+            path: str,
+            buffer_size: int = 1_000,
+            append: bool = True,
+            flush_interval: float = ...,
+    ) -> None:
+        super().__init__(path, buffer_size, append, flush_interval)
+
+        if csv_header(path) not in (None, FIELDS):
+            self.rotated = rotate(path)
+
+        else:
+            self.rotated = None
+
+    def _write(self, records: list[dict]) -> None:
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+        with open(self.path, "a", newline="") as out:
+            writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+
+            writer.writerows(records)
+
+
+class RecordSink(ResultsSink):
+    """
+    appends fixed size binary records (`RECORD_DTYPE`), see `read_records`
+    """
+    def _write(self, records: list[dict]) -> None:
+        array = np.zeros(len(records), dtype=RECORD_DTYPE)
+        for name in FIELDS:
+            values = [record[name] for record in records]
+            if name == "length":
+                values = [np.nan if value is None else value for value in values]
+
+            array[name] = values
+
+        with open(self.path, "ab") as out:
+            array.tofile(out)
+
+
+def csv_header(path: str) -> list[str] | None:
+    """
+    first line of a csv file, None if it doesn't exist or is empty
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+
+    with open(path, newline="") as inp:
+        return next(csv.reader(inp), None)
+
+
+def rotate(path: str) -> str:
+    """
+    move a file to the first free "<name>.<i><ext>"
+
+    :return: the new path
+    """
+    root, ext = os.path.splitext(path)
+    i = 1
+    while os.path.exists(f"{root}.{i}{ext}"):
+        i += 1
+
+    new_path = f"{root}.{i}{ext}"
+    os.replace(path, new_path)
+    return new_path
+
+
+def open_sink(
+        path: str | None,
+        buffer_size: int = 1_000,
+        append: bool = True,
+        flush_interval: float = ...,
+) -> ResultsSink:
+    """
+    binary records for .bin files, csv otherwise, nothing if path is None
+    """
+    if path is None:
+        return NullSink()
+
+    if path.endswith(".bin"):
+        return RecordSink(path, buffer_size, append, flush_interval)
+
+    return CsvSink(path, buffer_size, append, flush_interval)
+
+
+def read_records(path: str) -> np.ndarray:
+    """
+    read a file written by `RecordSink` (memory-mapped), a partially
+    written record at the end is ignored
+    """
+    count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+    if not count:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+
+    return np.memmap(path, RECORD_DTYPE, "r", shape=(count,))
+
+
+class ResultsAggregator:
+    """
+    follows a results file while it is being written: remembers how far it
+    has read and only parses what was appended since, keeping running
+    totals per finder
+    """
+    def __init__(self, path: str, max_bytes: int = 1_000_000) -> None:
+        """
+        :param max_bytes: read about this much per `update` (at least one
+            whole line), so a huge file is caught up with over several calls
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.binary = path.endswith(".bin")
+        self.reset()
+
+    def reset(self) -> None:
+        self.offset = 0
+        self.stats: dict[str, dict[str, float]] = {}
+        self._header: list[str] | None = None
+        self._file_id: tuple[int, int] | None = None
+
+    def update(self) -> bool:
+        """
+        read newly appended records
+
+        :return: True if there were any
+        """
+        if not os.path.exists(self.path):
+            return False
+
+        # the file was replaced (other inode, e.g. rotated) or truncated, start over
+        stat = os.stat(self.path)
+        file_id = (stat.st_dev, stat.st_ino)
+        if self._file_id not in (None, file_id) or stat.st_size < self.offset:
+            self.reset()
+
+        self._file_id = file_id
+
+        if self.binary:
+            return self._update_records()
+
+        return self._update_csv()
+
+    # internal functions
+    def _finder(self, name: str) -> dict[str, float]:
+        return self.stats.setdefault(name, {
+            "trials": 0,
+            "found": 0,
+            "wins": 0,
+            "time": 0.,
+            "length": 0.,
+            "expanded": 0,
+        })
+
+    def _update_csv(self) -> bool:
+        with open(self.path, "rb") as inp:
+            inp.seek(self.offset)
+            data = inp.read(self.max_bytes)
+
+            # a single line longer than max_bytes is read to its end
+            while b"\n" not in data:
+                chunk = inp.read(self.max_bytes)
+                if not chunk:
+                    break
+
+                data += chunk
+
+        # a line that is still being written is read again next time
+        data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            return False
+
+        self.offset += len(data)
+        rows = csv.reader(data.decode().splitlines())
+        if self._header is None:
+            self._header = next(rows)
+            missing = set(FIELDS) - set(self._header)
+            if missing:
+                raise ValueError(f"{self.path} has no header with {', '.join(sorted(missing))} (old format?)")
+
+        columns = {name: i for i, name in enumerate(self._header)}
+        finder, found, win = columns["finder"], columns["found"], columns["win"]
+        duration, length, expanded = columns["time"], columns["length"], columns["expanded"]
+
+        for row in rows:
+            stats = self._finder(row[finder])
+            stats["trials"] += 1
+            stats["time"] += float(row[duration])
+            stats["expanded"] += max(int(row[expanded]), 0)
+            stats["wins"] += row[win] == "True"
+            if row[found] == "True":
+                stats["found"] += 1
+                stats["length"] += float(row[length])
+
+        return True
+
+    def _update_records(self) -> bool:
+        count = min(os.path.getsize(self.path) - self.offset, self.max_bytes) // RECORD_DTYPE.itemsize
+        if not count:
+            return False
+
+        records = np.fromfile(self.path, RECORD_DTYPE, count, offset=self.offset)
+        self.offset += count * RECORD_DTYPE.itemsize
+
+        names, finders = np.unique(records["finder"], return_inverse=True)
+        for i, name in enumerate(names):
+            finder_records = records[finders == i]
+            found = finder_records["found"]
+
+            stats = self._finder(name.decode())
+            stats["trials"] += len(finder_records)
+            stats["found"] += int(np.count_nonzero(found))
+            stats["wins"] += int(np.count_nonzero(finder_records["win"]))
+            stats["time"] += float(finder_records["time"].sum())
+            stats["length"] += float(finder_records["length"][found].sum())
+            stats["expanded"] += int(finder_records["expanded"].clip(0).sum())
+
+        return True
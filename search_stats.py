@@ -0,0 +1,138 @@
+"""
+Author:
+Nilusink
+
+opt-in instrumentation of the finders: what a search did and where the
+time went. finders only touch it if they were given one, so a run
+without stats costs nothing extra
+"""
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterator
+import tracemalloc
+import time
+
+
+# phases finders (and main, for "shortening") report times for
+PHASES: tuple[str, ...] = ("request_all", "request_from_target", "node_finder", "search", "shortening")
+
+
+class SearchStats:
+    """
+    counters of one or more searches (`reset` to start over)
+
+    expanded:       different nodes whose connections were requested
+    requests:       calls of the connection requester, including repeats
+    frontier_peak:  largest size of the open set (heap, queue, layer)
+    sorts:          number of `sorted` calls on neighbor lists
+    phases:         wall time per phase in seconds
+    peak_memory:    bytes, only set by `track_memory`
+    """
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.frontier_peak = 0
+        self.sorts = 0
+        self.phases: dict[str, float] = {}
+        self.peak_memory: int | None = None
+        self._expanded: set[Hashable] = set()
+
+    @property
+    def expanded(self) -> int:
+        return len(self._expanded)
+
+    def count_request(self, node: Hashable) -> None:
+        self.requests += 1
+        self._expanded.add(node)
+
+    def counting(self, request_node_connections: Callable) -> Callable:
+        """
+        wrap a connection requester so every call is counted (every node
+        of a `request_many` batch counts as one request)
+        """
+        def requester(node):
+            self.requests += 1
+            self._expanded.add(node)
+            return request_node_connections(node)
+
+        batched = getattr(request_node_connections, "request_many", None)
+        if batched is not None:
+            def request_many(nodes):
+                nodes = list(nodes)
+                self.requests += len(nodes)
+                self._expanded.update(nodes)
+                return batched(nodes)
+
+            requester.request_many = request_many
+
+        return requester
+
+    def frontier(self, size: int) -> None:
+        if size > self.frontier_peak:
+            self.frontier_peak = size
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        add the time spent in the block to a phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    @contextmanager
+    def track_memory(self) -> Iterator[None]:
+        """
+        peak memory allocated in the block (tracemalloc, slows everything
+        down, so don't time the same run)
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - base
+            self.peak_memory = max(self.peak_memory or 0, peak)
+            if started:
+                tracemalloc.stop()
+
+    def as_record(self) -> dict:
+        """
+        flat dict for the benchmark output, one "time_<phase>" per phase
+        """
+        record = {
+            "expanded": self.expanded,
+            "requests": self.requests,
+            "frontier_peak": self.frontier_peak,
+            "sorts": self.sorts,
+            "peak_memory": self.peak_memory,
+        }
+        for name in PHASES:
+            record[f"time_{name}"] = self.phases.get(name)
+
+        return record
+
+
+@contextmanager
+def phase(stats: SearchStats | None, name: str) -> Iterator[None]:
+    """
+    `stats.phase(name)` if stats are enabled, nothing otherwise
+    """
+    if stats is None:
+        yield
+
+    else:
+        with stats.phase(name):
+            yield
@@ -1,74 +1,67 @@
 """
 Author:
 Nilusink
+
+live dashboard of a results file (see results.py), only newly appended
+records are read on every frame
+
+usage:
+    python test_results.py [results.csv | results.bin]
 """
 import matplotlib.animation as anim
 import matplotlib.pyplot as plt
-from time import sleep
-import numpy as np
-
-
-DELAY: float = .5
-
-
-def re_read() -> dict:
-    data: list[list[float]] = []
-    with open("results.csv", "r") as inp:
-        for line in inp.readlines():
-            line = line.rstrip("\r")
-            data.append([float(el) for el in line.split(",")])
+from results import ResultsAggregator
+import sys
 
-    d_data: dict[str, list[float]] = {
-        "t1": [],
-        "l1": [],
-        "t2": [],
-        "l2": [],
-    }
-    for row in data:
-        d_data["t1"].append(row[0])
-        d_data["l1"].append(row[1])
-        d_data["t2"].append(row[2])
-        d_data["l2"].append(row[3])
 
-    return d_data
+RESULTS_FILE: str = "results.csv"
+FPS: float = 10
 
 
 def main():
+    aggregator = ResultsAggregator(sys.argv[1] if len(sys.argv) > 1 else RESULTS_FILE)
+
     fig = plt.figure(num="Algorithms")
-    # fig.set_title("Algorithms")
-    # fig.set_ylabel("Wins")
     als = fig.add_subplot(1, 1, 1)
+    als.set_ylabel("Wins")
     als.grid()
 
-    colors = ['tab:red', 'tab:green']
-    names = ["Algorithm 1", "Algorithm 2"]
+    colors = ['tab:red', 'tab:green', 'tab:blue', 'tab:orange']
+    bars = als.bar([], [])
 
     def update(*_e):
-        nonlocal lines
-        d_data = re_read()
-        lines.remove()
-        lines = als.bar(names, np.array([sum(d_data["l1"]), sum(d_data["l2"])]), color=colors)
+        nonlocal bars
+        if not aggregator.update():
+            return
+
+        names = list(aggregator.stats)
+        wins = [stats["wins"] for stats in aggregator.stats.values()]
+
+        # only create new bars if a finder was added
+        if len(bars) != len(names):
+            bars.remove()
+            bars = als.bar(names, wins, color=colors)
+
+        else:
+            for bar, height in zip(bars, wins):
+                bar.set_height(height)
 
         als.relim()
         als.autoscale_view()
 
-        plt.tight_layout()
-        sleep(DELAY)
-
-    lines = als.bar(names, [0, 0], color=colors)
-    _a = anim.FuncAnimation(fig, update, repeat=True, interval=0)
+    _a = anim.FuncAnimation(fig, update, interval=1000 / FPS, cache_frame_data=False)
+    plt.tight_layout()
     plt.show()
 
-    d_data = re_read()
-    print(f"""
-Finder 1:
-total time: {sum(d_data["t1"])}
-first: {sum(d_data["l1"])}
+    # catch up with everything that is left
+    while aggregator.update():
+        pass
 
-Finder 2:
-total time: {sum(d_data["t2"])}
-first: {sum(d_data["l2"])}
-""")
+    for name, stats in aggregator.stats.items():
+        print(f"""
+{name}:
+total time: {stats["time"]}
+first: {stats["wins"]}""")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,139 @@
+"""
+Author:
+Nilusink
+
+random-graph tournament between the finders, independent trials are
+run in parallel on a process pool
+
+usage:
+    python tournament.py --trials 10000 --workers 8 --out tournament.csv
+"""
+from benchmark import run_trial, write_records
+from concurrent.futures import ProcessPoolExecutor
+from path_finders import FINDERS
+from functools import partial
+import argparse
+import time
+import os
+
+
+NUMBER_NODES: int = 500
+NODE_RANGE: float = 150
+
+
+def play(seed: int, n: int, node_range: float, finders: list[str]) -> list[dict]:
+    """
+    a single trial: one graph, every finder on the same (origin, target) pair
+    """
+    return run_trial(n, node_range, seed, {name: FINDERS[name] for name in finders}, measure_memory=False)
+
+
+def run_tournament(
+        n_trials: int,
+        n: int = NUMBER_NODES,
+        node_range: float = NODE_RANGE,
+        finders: list[str] = ...,
+        workers: int = ...,
+        first_seed: int = 0,
+) -> list[dict]:
+    """
+    :param workers: number of processes (1 = run in this process),
+        defaults to the number of cpus
+    :return: records of all trials, in seed order (independent of `workers`)
+    """
+    if finders is ...:
+        finders = list(FINDERS)
+
+    if workers is ...:
+        workers = os.cpu_count() or 1
+
+    seeds = range(first_seed, first_seed + n_trials)
+    trial = partial(play, n=n, node_range=node_range, finders=finders)
+
+    if workers == 1:
+        results = map(trial, seeds)
+
+    else:
+        # map keeps the order of the seeds, so merging is deterministic
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(trial, seeds, chunksize=max(1, n_trials // (workers * 16))))
+
+    return [record for records in results for record in records]
+
+
+def aggregate(records: list[dict]) -> dict[str, dict]:
+    """
+    per finder: trials, paths found, wins (shortest path of the trial),
+    total time and mean length / optimum (over the trials that have one,
+    nan if none do)
+    """
+    stats: dict[str, dict] = {}
+    trials: dict[int, list[dict]] = {}
+    for record in records:
+        trials.setdefault(record["seed"], []).append(record)
+        stats.setdefault(record["finder"], {
+            "trials": 0,
+            "found": 0,
+            "wins": 0,
+            "time": 0.,
+            "ratio": 0.,
+            "ratios": 0,
+        })
+
+    for seed in sorted(trials):
+        found = [r for r in trials[seed] if r["found"]]
+        shortest = min((r["length"] for r in found), default=None)
+
+        for record in trials[seed]:
+            finder_stats = stats[record["finder"]]
+            finder_stats["trials"] += 1
+            finder_stats["time"] += record["time"]
+
+            if record["found"]:
+                finder_stats["found"] += 1
+                finder_stats["wins"] += int(record["length"] == shortest)
+
+            # no ratio if origin and target are at the same position
+            if record["found"] and record["ratio"] is not None:
+                finder_stats["ratio"] += record["ratio"]
+                finder_stats["ratios"] += 1
+
+    for finder_stats in stats.values():
+        if finder_stats["ratios"]:
+            finder_stats["ratio"] /= finder_stats["ratios"]
+
+        else:
+            finder_stats["ratio"] = float("nan")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="random-graph tournament between the path finders")
+    parser.add_argument("--trials", type=int, default=1_000)
+    parser.add_argument("--nodes", type=int, default=NUMBER_NODES)
+    parser.add_argument("--range", type=float, default=NODE_RANGE)
+    parser.add_argument("--finders", nargs="+", default=list(FINDERS), choices=list(FINDERS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--out", help="write all records to a .json, .bin or .csv file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = run_tournament(args.trials, args.nodes, args.range, args.finders, args.workers, args.first_seed)
+    duration = time.perf_counter() - start
+
+    if args.out:
+        write_records(records, args.out)
+
+    print(f"{args.trials} trials on {args.workers} worker(s): {duration:.2f}s ({args.trials / duration:.1f} trials/s)\n")
+    print(f"{'finder':<20} {'found':>7} {'wins':>7} {'total time':>11} {'length/opt':>11}")
+    for finder, finder_stats in aggregate(records).items():
+        print(
+            f"{finder:<20} {finder_stats['found']:>7} {finder_stats['wins']:>7} "
+            f"{finder_stats['time']:>10.2f}s {finder_stats['ratio']:>11.4f}"
+        )
+
+
+if __name__ == '__main__':
+    main()